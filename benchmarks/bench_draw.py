@@ -0,0 +1,77 @@
+# 非表示オブジェクト描画のフレーム時間ベンチマーク
+# 使い方: blender --factory-startup --python benchmarks/bench_draw.py
+# - GPU 描画が必要なため --background では実行できない
+# - 立方体のリンク複製を N 個非表示にし、一括描画の有無で
+#   wm.redraw_timer による 1 フレームあたりの描画時間を比較する
+import os
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import ghost_mesh
+
+COUNTS = (1, 100, 1000, 5000)
+ITERATIONS = 20
+
+
+def setup_scene(count):
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    mesh = bpy.data.meshes.get("bench_cube") or _make_cube()
+    collection = bpy.context.scene.collection
+    side = max(1, int(round(count ** (1.0 / 3.0))))
+    for i in range(count):
+        obj = bpy.data.objects.new(f"bench_{i}", mesh)
+        obj.location = (i % side * 3.0, i // side % side * 3.0, i // (side * side) * 3.0)
+        collection.objects.link(obj)
+        obj.hide_set(True)
+
+
+def _make_cube():
+    mesh = bpy.data.meshes.new("bench_cube")
+    verts = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+    faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    mesh.from_pydata(verts, [], faces)
+    return mesh
+
+
+def frame_time(context_override):
+    with bpy.context.temp_override(**context_override):
+        bpy.ops.wm.redraw_timer(type='DRAW', iterations=2)  # キャッシュの構築
+        t = time.perf_counter()
+        bpy.ops.wm.redraw_timer(type='DRAW', iterations=ITERATIONS)
+    return (time.perf_counter() - t) * 1000.0 / ITERATIONS
+
+
+def run():
+    window = bpy.context.window_manager.windows[0]
+    area = next(a for a in window.screen.areas if a.type == 'VIEW_3D')
+    region = next(r for r in area.regions if r.type == 'WINDOW')
+    override = {"window": window, "area": area, "region": region}
+
+    scn = bpy.context.scene
+    scn.object_ghost_display_face = True
+    scn.object_ghost_display_edge = True
+    print(f"{'objects':>8} {'per-object ms':>14} {'batched ms':>12}")
+    for count in COUNTS:
+        setup_scene(count)
+        scn.ghost_batched_draw = False
+        single = frame_time(override)
+        scn.ghost_batched_draw = True
+        batched = frame_time(override)
+        print(f"{count:>8} {single:>14.2f} {batched:>12.2f}")
+    bpy.ops.wm.quit_blender()
+
+
+def main():
+    if "ghost_mesh" not in bpy.context.preferences.addons:
+        ghost_mesh.register()
+    bpy.ops.gm.custom_draw('INVOKE_DEFAULT')
+    # ウィンドウが表示されてから計測を開始する
+    bpy.app.timers.register(run, first_interval=1.0)
+
+
+if __name__ == "__main__":
+    main()
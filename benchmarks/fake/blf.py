@@ -0,0 +1,17 @@
+# blf の簡易代替（ベンチマーク専用）
+
+
+def size(font_id, size):
+    pass
+
+
+def color(font_id, r, g, b, a):
+    pass
+
+
+def position(font_id, x, y, z):
+    pass
+
+
+def draw(font_id, text):
+    pass
@@ -0,0 +1,10 @@
+# bmesh の簡易代替（ベンチマーク専用）
+# - ベンチマーク対象の処理は BMesh を使用しないため、import のみを可能にする
+
+
+def new():
+    raise NotImplementedError("bmesh is not available in the fake environment")
+
+
+def from_edit_mesh(mesh):
+    raise NotImplementedError("bmesh is not available in the fake environment")
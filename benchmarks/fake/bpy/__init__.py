@@ -0,0 +1,97 @@
+# bpy の簡易代替（ベンチマーク専用）
+# - Ghost Mesh が使用するデータ構造と API のみを NumPy で再現する
+from types import SimpleNamespace
+
+from . import types
+from . import props
+from . import app
+
+
+class _DataCollection:
+    def __init__(self, factory):
+        self._factory = factory
+        self._items = []
+
+    def new(self, name, *args):
+        item = self._factory(name, *args)
+        self._items.append(item)
+        return item
+
+    def remove(self, item):
+        if item in self._items:
+            self._items.remove(item)
+        for scene in data.scenes:
+            scene.collection.objects.unlink(item)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+
+data = SimpleNamespace(
+    meshes=_DataCollection(types.Mesh),
+    objects=_DataCollection(types.Object),
+    materials=_DataCollection(types.Material),
+    scenes=[],
+)
+
+_scene = types.Scene("Scene")
+data.scenes.append(_scene)
+
+
+class _Region:
+    height = 720
+    width = 1280
+
+    def as_pointer(self):
+        return id(self)
+
+
+class _Context:
+    scene = _scene
+    active_object = None
+    region = _Region()
+    screen = SimpleNamespace(areas=[])
+
+    def evaluated_depsgraph_get(self):
+        return None
+
+
+context = _Context()
+
+
+class _Utils:
+    @staticmethod
+    def register_class(cls):
+        pass
+
+    @staticmethod
+    def unregister_class(cls):
+        pass
+
+
+utils = _Utils()
+
+
+class _Path:
+    # 相対パス（// から始まるパス）は使用しないため、そのまま返す
+    @staticmethod
+    def abspath(path):
+        return path
+
+
+path = _Path()
+
+
+class _Ops:
+    # bpy.ops.xxx.yyy(...) の呼び出しを全て受け付けて何もしない
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return {'FINISHED'}
+
+
+ops = _Ops()
@@ -0,0 +1,30 @@
+# bpy.app の簡易代替（ベンチマーク専用）
+from types import SimpleNamespace
+
+from . import handlers
+
+version = (4, 0, 0)
+version_string = "fake"
+
+
+class _Timers:
+    def __init__(self):
+        self._registered = set()
+
+    def register(self, func, first_interval=0.0):
+        self._registered.add(func)
+
+    def unregister(self, func):
+        self._registered.discard(func)
+
+    def is_registered(self, func):
+        return func in self._registered
+
+
+timers = _Timers()
+
+translations = SimpleNamespace(
+    pgettext=lambda text, *args: text,
+    register=lambda name, table: None,
+    unregister=lambda name: None,
+)
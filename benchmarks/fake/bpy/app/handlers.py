@@ -0,0 +1,10 @@
+# bpy.app.handlers の簡易代替（ベンチマーク専用）
+load_post = []
+undo_post = []
+redo_post = []
+depsgraph_update_post = []
+frame_change_post = []
+
+
+def persistent(func):
+    return func
@@ -0,0 +1,93 @@
+# bpy.props の簡易代替（ベンチマーク専用）
+# - プロパティはインスタンスごとの値を保持するディスクリプタとして再現する（update は呼ばない）
+
+
+class _Property:
+    def __init__(self, default=None, **kwargs):
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def _key(self):
+        return "_prop_" + str(id(self))
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.__dict__.get(self._key(), self.default)
+
+    def __set__(self, instance, value):
+        instance.__dict__[self._key()] = value
+
+
+class _PropCollection:
+    def __init__(self, item_type):
+        self._type = item_type
+        self._items = []
+
+    def add(self):
+        item = self._type()
+        self._items.append(item)
+        return item
+
+    def remove(self, index):
+        del self._items[index]
+
+    def clear(self):
+        self._items.clear()
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class _CollectionProperty(_Property):
+    def __init__(self, type=None, **kwargs):
+        super().__init__()
+        self.type = type
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        key = self._key()
+        if key not in instance.__dict__:
+            instance.__dict__[key] = _PropCollection(self.type)
+        return instance.__dict__[key]
+
+
+def BoolProperty(**kwargs):
+    return _Property(kwargs.pop("default", False), **kwargs)
+
+
+def IntProperty(**kwargs):
+    return _Property(kwargs.pop("default", 0), **kwargs)
+
+
+def FloatProperty(**kwargs):
+    return _Property(kwargs.pop("default", 0.0), **kwargs)
+
+
+def FloatVectorProperty(**kwargs):
+    return _Property(tuple(kwargs.pop("default", (0.0, 0.0, 0.0))), **kwargs)
+
+
+def StringProperty(**kwargs):
+    return _Property(kwargs.pop("default", ""), **kwargs)
+
+
+def EnumProperty(**kwargs):
+    return _Property(kwargs.pop("default", None), **kwargs)
+
+
+def PointerProperty(**kwargs):
+    return _Property(None)
+
+
+def CollectionProperty(**kwargs):
+    return _CollectionProperty(**kwargs)
@@ -0,0 +1,267 @@
+# bpy.types の簡易代替（ベンチマーク専用）
+import itertools
+
+import numpy as np
+from mathutils import Matrix
+
+_uid = itertools.count(1)
+
+
+class bpy_struct:
+    pass
+
+
+class PropertyGroup(bpy_struct):
+    pass
+
+
+class Operator(bpy_struct):
+    def report(self, level, message):
+        pass
+
+
+class Panel(bpy_struct):
+    pass
+
+
+class UIList(bpy_struct):
+    pass
+
+
+class SpaceView3D:
+    @staticmethod
+    def draw_handler_add(func, args, region, draw_type):
+        return (func, draw_type)
+
+    @staticmethod
+    def draw_handler_remove(handle, region):
+        pass
+
+
+class ID(bpy_struct):
+    def __init__(self, name):
+        self.name = name
+        self.session_uid = next(_uid)
+
+    @property
+    def name_full(self):
+        return self.name
+
+    @property
+    def original(self):
+        return self
+
+    def as_pointer(self):
+        return id(self)
+
+
+# foreach_get/foreach_set で読み書きできる属性配列の集合
+# - schema は {属性名: (dtype, 要素あたりの値の数)}
+class _AttrCollection:
+    def __init__(self, schema):
+        self._schema = schema
+        self._arrays = {name: np.zeros((0, width), dtype=dtype) for name, (dtype, width) in schema.items()}
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def add(self, count):
+        for name, array in self._arrays.items():
+            extra = np.zeros((count, array.shape[1]), dtype=array.dtype)
+            self._arrays[name] = np.concatenate((array, extra))
+        self._len += count
+
+    def resize(self, count):
+        for name, (dtype, width) in self._schema.items():
+            self._arrays[name] = np.zeros((count, width), dtype=dtype)
+        self._len = count
+
+    def foreach_get(self, name, out):
+        out[...] = self._arrays[name].reshape(out.shape)
+
+    def foreach_set(self, name, values):
+        array = self._arrays[name]
+        array[...] = np.asarray(values).reshape(array.shape)
+
+    def array(self, name):
+        return self._arrays[name]
+
+
+class Material(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.diffuse_color = (0.8, 0.8, 0.8, 1.0)
+
+
+class Mesh(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.vertices = _AttrCollection({"co": (np.float32, 3), "hide": (bool, 1)})
+        self.edges = _AttrCollection({"vertices": (np.int32, 2), "hide": (bool, 1)})
+        self.loops = _AttrCollection({"vertex_index": (np.int32, 1), "edge_index": (np.int32, 1)})
+        self.polygons = _AttrCollection({
+            "loop_start": (np.int32, 1), "loop_total": (np.int32, 1),
+            "hide": (bool, 1), "material_index": (np.int32, 1), "normal": (np.float32, 3)})
+        self.loop_triangles = _AttrCollection({"vertices": (np.int32, 3), "material_index": (np.int32, 1),
+                                              "polygon_index": (np.int32, 1)})
+        self.materials = []
+
+    # 辺の作成（calc_edges）と面法線の計算を行う
+    def update(self, calc_edges=False):
+        loop_vert = self.loops.array("vertex_index")[:, 0]
+        starts = self.polygons.array("loop_start")[:, 0]
+        totals = self.polygons.array("loop_total")[:, 0]
+        offset = np.arange(len(loop_vert)) - np.repeat(starts, totals)
+        following = np.repeat(starts, totals) + (offset + 1) % np.repeat(totals, totals)
+        if calc_edges:
+            pairs = np.sort(np.stack((loop_vert, loop_vert[following]), axis=1), axis=1)
+            edges, edge_index = np.unique(pairs, axis=0, return_inverse=True)
+            self.edges.resize(len(edges))
+            self.edges.foreach_set("vertices", edges)
+            self.loops.foreach_set("edge_index", edge_index.ravel())
+        # 先頭の 3 頂点から面法線を求める
+        co = self.vertices.array("co")
+        a, b, c = co[loop_vert[starts]], co[loop_vert[starts + 1]], co[loop_vert[starts + 2]]
+        normals = np.cross(b - a, c - a)
+        normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+        self.polygons.foreach_set("normal", normals)
+
+    # 面を扇状に三角形分割する
+    def calc_loop_triangles(self):
+        loop_vert = self.loops.array("vertex_index")[:, 0]
+        starts = self.polygons.array("loop_start")[:, 0]
+        totals = self.polygons.array("loop_total")[:, 0]
+        counts = totals - 2
+        poly = np.repeat(np.arange(len(totals)), counts)
+        step = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        first = starts[poly]
+        tris = np.stack((loop_vert[first], loop_vert[first + step + 1], loop_vert[first + step + 2]), axis=1)
+        self.loop_triangles.resize(len(tris))
+        self.loop_triangles.foreach_set("vertices", tris)
+        self.loop_triangles.foreach_set("material_index", self.polygons.array("material_index")[poly, 0])
+        self.loop_triangles.foreach_set("polygon_index", poly)
+
+
+# RNA プロパティ定義（_modifier_signature が参照する属性のみ）
+class _Property:
+    def __init__(self, identifier, value):
+        self.identifier = identifier
+        self.is_enum_flag = isinstance(value, set)
+        self.is_array = isinstance(value, tuple)
+        if isinstance(value, bool):
+            self.type = 'BOOLEAN'
+        elif isinstance(value, int):
+            self.type = 'INT'
+        elif isinstance(value, float):
+            self.type = 'FLOAT'
+        elif isinstance(value, (str, set)):
+            self.type = 'ENUM'
+        elif isinstance(value, tuple):
+            self.type = 'FLOAT'
+        else:
+            self.type = 'POINTER'
+
+
+class _RNA:
+    def __init__(self, properties):
+        self.properties = properties
+
+
+# モディファイア（プロパティは keyword 引数で指定する）
+# - Blender と同様に ID プロパティには対応しない（keys() は TypeError）
+class Modifier(bpy_struct):
+    def __init__(self, name, mod_type, **values):
+        self.name = name
+        self.type = mod_type
+        self.show_viewport = True
+        for key, value in values.items():
+            setattr(self, key, value)
+        self.bl_rna = _RNA([_Property(key, value) for key, value in
+                            (("rna_type", None), ("name", name), ("show_viewport", True), *values.items())])
+
+    def keys(self):
+        raise TypeError("bpy_struct: this type doesn't support IDProperties")
+
+
+class _MaterialSlot:
+    def __init__(self, material):
+        self.material = material
+
+
+class Object(ID):
+    def __init__(self, name, data):
+        super().__init__(name)
+        self.data = data
+        self.type = 'MESH' if isinstance(data, Mesh) else 'EMPTY'
+        self.mode = 'OBJECT'
+        self.matrix_world = Matrix.Identity(4)
+        self.modifiers = []
+        self._hide = False
+        self._select = False
+
+    def hide_get(self):
+        return self._hide
+
+    def hide_set(self, state):
+        self._hide = state
+
+    def select_get(self):
+        return self._select
+
+    def select_set(self, state):
+        self._select = state
+
+    @property
+    def material_slots(self):
+        return [_MaterialSlot(mat) for mat in self.data.materials] if self.type == 'MESH' else []
+
+    @property
+    def bound_box(self):
+        co = self.data.vertices.array("co") if self.type == 'MESH' else np.zeros((0, 3))
+        if len(co) == 0:
+            return [(0.0, 0.0, 0.0)] * 8
+        lo, hi = co.min(axis=0), co.max(axis=0)
+        return [(x, y, z) for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])]
+
+    def evaluated_get(self, depsgraph):
+        return self
+
+    def to_mesh(self):
+        return self.data
+
+    def to_mesh_clear(self):
+        pass
+
+
+class _ObjectLinks:
+    def __init__(self):
+        self._objects = {}
+
+    def link(self, obj):
+        self._objects[obj.session_uid] = obj
+
+    def unlink(self, obj):
+        self._objects.pop(obj.session_uid, None)
+
+    def __iter__(self):
+        return iter(list(self._objects.values()))
+
+    def __len__(self):
+        return len(self._objects)
+
+
+class Collection(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.objects = _ObjectLinks()
+
+
+class Scene(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.collection = Collection("Scene Collection")
+
+    @property
+    def objects(self):
+        return self.collection.objects
@@ -0,0 +1,5 @@
+# bpy_extras.io_utils の簡易代替（ベンチマーク専用）
+
+
+class ExportHelper:
+    filepath = ""
@@ -0,0 +1,107 @@
+# gpu の簡易代替（ベンチマーク専用）
+# - GPU バッファは NumPy 配列へのコピーとして扱い、描画は行わない
+from types import SimpleNamespace
+
+import numpy as np
+from mathutils import Matrix
+
+
+class GPUVertFormat:
+    def __init__(self):
+        self.attrs = {}
+
+    def attr_add(self, id, comp_type, len, fetch_mode):
+        self.attrs[id] = len
+
+
+class GPUVertBuf:
+    def __init__(self, format, len):
+        self.format = format
+        self.data = {}
+
+    def attr_fill(self, id, data):
+        self.data[id] = np.array(data, dtype=np.float32)
+
+
+class GPUIndexBuf:
+    def __init__(self, type, seq):
+        self.indices = np.array(seq, dtype=np.int32)
+
+
+class GPUBatch:
+    def __init__(self, type, buf, elem=None):
+        self.buf = buf
+        self.elem = elem
+        self.extra = []
+
+    def vertbuf_add(self, buf):
+        self.extra.append(buf)
+
+    def draw(self, shader=None):
+        pass
+
+    def draw_instanced(self, shader, instance_start=0, instance_count=0):
+        pass
+
+
+class GPUUniformBuf:
+    def __init__(self, data):
+        self.data = bytes(data)
+
+    def update(self, data):
+        self.data = bytes(data)
+
+
+class GPUShader:
+    def bind(self):
+        pass
+
+    def uniform_float(self, name, value):
+        pass
+
+    def uniform_int(self, name, value):
+        pass
+
+    def uniform_block(self, name, ubo):
+        pass
+
+
+class GPUShaderCreateInfo:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class GPUStageInterfaceInfo:
+    def __init__(self, name):
+        self.name = name
+
+    def flat(self, type, name):
+        pass
+
+    def smooth(self, type, name):
+        pass
+
+
+types = SimpleNamespace(
+    GPUVertFormat=GPUVertFormat, GPUVertBuf=GPUVertBuf, GPUIndexBuf=GPUIndexBuf,
+    GPUBatch=GPUBatch, GPUUniformBuf=GPUUniformBuf, GPUShader=GPUShader,
+    GPUShaderCreateInfo=GPUShaderCreateInfo, GPUStageInterfaceInfo=GPUStageInterfaceInfo,
+)
+
+shader = SimpleNamespace(
+    from_builtin=lambda name: GPUShader(),
+    create_from_info=lambda info: GPUShader(),
+)
+
+matrix = SimpleNamespace(
+    get_model_view_matrix=lambda: Matrix.Identity(4),
+    get_projection_matrix=lambda: Matrix.Identity(4),
+)
+
+state = SimpleNamespace(
+    depth_test_set=lambda mode: None,
+    blend_set=lambda mode: None,
+    face_culling_set=lambda mode: None,
+    line_width_set=lambda width: None,
+    depth_mask_set=lambda value: None,
+)
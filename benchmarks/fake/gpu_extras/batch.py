@@ -0,0 +1,12 @@
+# gpu_extras.batch の簡易代替（ベンチマーク専用）
+import gpu
+
+
+def batch_for_shader(shader, type, content, indices=None):
+    count = len(next(iter(content.values())))
+    fmt = gpu.types.GPUVertFormat()
+    vbo = gpu.types.GPUVertBuf(fmt, count)
+    for name, data in content.items():
+        vbo.attr_fill(id=name, data=data)
+    elem = gpu.types.GPUIndexBuf(type=type, seq=indices) if indices is not None else None
+    return gpu.types.GPUBatch(type=type, buf=vbo, elem=elem)
@@ -0,0 +1,84 @@
+# mathutils の簡易代替（ベンチマーク専用）
+import numpy as np
+
+
+class Matrix:
+    def __init__(self, rows=None):
+        self._m = np.array(rows if rows is not None else np.eye(4), dtype=np.float64)
+
+    @classmethod
+    def Identity(cls, size):
+        return cls(np.eye(size))
+
+    @classmethod
+    def Diagonal(cls, vector):
+        return cls(np.diag(np.asarray(vector, dtype=np.float64)))
+
+    @classmethod
+    def Translation(cls, vector):
+        m = np.eye(4)
+        m[:3, 3] = vector
+        return cls(m)
+
+    def copy(self):
+        return Matrix(self._m.copy())
+
+    def inverted(self):
+        return Matrix(np.linalg.inv(self._m))
+
+    @property
+    def translation(self):
+        return self._m[:3, 3].copy()
+
+    def __array__(self, dtype=None, copy=None):
+        return self._m.astype(dtype) if dtype is not None else self._m
+
+    def __iter__(self):
+        return iter(self._m)
+
+    def __getitem__(self, index):
+        return self._m[index]
+
+    def __matmul__(self, other):
+        if isinstance(other, Vector):
+            # Blender と同様に 4x4 @ 3D ベクトルは点として変換する
+            if len(self._m) == 4 and len(other._v) == 3:
+                return Vector(self._m[:3, :3] @ other._v + self._m[:3, 3])
+            return Vector(self._m @ other._v)
+        return Matrix(self._m @ np.asarray(other))
+
+    def __eq__(self, other):
+        return isinstance(other, Matrix) and np.array_equal(self._m, other._m)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+
+class Vector:
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        self._v = np.array(values, dtype=np.float64)
+
+    def __array__(self, dtype=None, copy=None):
+        return self._v.astype(dtype) if dtype is not None else self._v
+
+    def __iter__(self):
+        return iter(self._v)
+
+    def to_4d(self):
+        return Vector(np.append(self._v[:3], 1.0))
+
+    @property
+    def x(self):
+        return self._v[0]
+
+    @property
+    def y(self):
+        return self._v[1]
+
+    @property
+    def z(self):
+        return self._v[2]
+
+    @property
+    def w(self):
+        return self._v[3]
@@ -0,0 +1,732 @@
+# ゴースト描画パイプラインのベンチマークスイート
+# 使い方:
+#   blender --background --factory-startup --python benchmarks/run_suite.py -- [オプション]
+#   python benchmarks/run_suite.py [オプション]
+# - Blender 外で実行した場合は benchmarks/fake の代替モジュール（NumPy 実装、GPU 不要）を使用する
+# - 合成メッシュ・シーンに対して編集モード/オブジェクトモードのキャッシュ生成、
+#   depsgraph ハンドラ、オブジェクト一覧の同期、視錐台カリングを計測する
+# - *_legacy のシナリオは最適化前の実装で、同じパラメータの新しい実装と比較する
+#   （BMesh 等を使うものは BLENDER_ONLY に含め、代替モジュールでは実行しない）
+# - 非表示オブジェクトの GPU 描画時間は bench_draw.py（GPU が必要）で計測する
+# - --output で結果を JSON に保存し、--compare で以前の結果（別コミット）と比較する
+#   （代替モジュールと Blender の結果は比較できない）
+#
+# オプション例:
+#   --scenario edit_cache object_cache --faces 10000 100000 --hidden-ratio 0.5 --materials 1 8
+#   --objects 1000 10000 --repeat 5 --output after.json --compare before.json
+import argparse
+import itertools
+import json
+import os
+import math
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+try:
+    import bpy
+    BACKEND = "blender"
+except ImportError:
+    sys.path.insert(0, os.path.join(ROOT, "fake"))
+    import bpy
+    BACKEND = "fake"
+
+import bmesh
+import numpy as np
+from mathutils import Matrix, Vector
+
+sys.path.insert(0, os.path.join(ROOT, "..", "src"))
+import ghost_mesh
+from ghost_mesh import gm_core
+from ghost_mesh import gm_draw
+from ghost_mesh import gm_panel
+from ghost_mesh import gm_prop
+
+
+# シナリオごとに使用するパラメータ
+SCENARIOS = {
+    "edit_cache"            : ("faces", "hidden_ratio", "materials"),
+    "edit_cache_legacy"     : ("faces", "hidden_ratio", "materials"),
+    "object_read"           : ("faces",),
+    "object_read_legacy"    : ("faces",),
+    "object_cache"          : ("faces", "materials"),
+    "disk_cache"            : ("faces", "materials"),
+    "deform"                : ("faces", "materials"),
+    "proxy"                 : ("faces", "materials"),
+    "lod"                   : ("faces",),
+    "display_toggle"        : ("faces", "materials"),
+    "display_toggle_legacy" : ("faces", "materials"),
+    "depsgraph"             : ("objects", "hidden_ratio"),
+    "depsgraph_legacy"      : ("objects", "hidden_ratio"),
+    "depsgraph_external"    : ("objects", "hidden_ratio"),
+    "object_list"           : ("objects",),
+    "object_list_add"       : ("objects",),
+    "object_list_legacy"    : ("objects",),
+    "cull"                  : ("objects", "hidden_ratio"),
+    "cull_legacy"           : ("objects", "hidden_ratio"),
+    "viewports"             : ("objects", "hidden_ratio"),
+    "merged"                : ("objects", "hidden_ratio"),
+}
+
+# BMesh・RNA の要素ごとのアクセスが必要なため Blender でのみ実行するシナリオ
+BLENDER_ONLY = {"edit_cache_legacy", "object_read_legacy", "display_toggle_legacy"}
+
+# 計測とは別に 1 回実行し、ピークメモリ（tracemalloc）も記録するシナリオ
+MEMORY_SCENARIOS = {"object_read", "object_read_legacy"}
+
+# depsgraph_external でシーン外から更新されるオブジェクト数
+EXTERNAL_UPDATES = 20
+
+# 詳細度の生成に使う三角形数の上限（Scene.ghost_lod_budget の既定値）
+LOD_BUDGET = 250_000
+
+
+# 四角形面のグリッドメッシュを作成する
+# - hidden_ratio の割合の面を非表示にし、面のマテリアルを materials 個のスロットに振り分ける
+def make_grid_mesh(name, faces, hidden_ratio=0.0, materials=1):
+    side = max(1, int(round(faces ** 0.5)))
+    n_faces = side * side
+    grid = np.arange((side + 1) * (side + 1)).reshape(side + 1, side + 1)
+    xs, ys = np.meshgrid(np.linspace(-1.0, 1.0, side + 1), np.linspace(-1.0, 1.0, side + 1))
+    co = np.stack((xs.ravel(), ys.ravel(), np.zeros(xs.size)), axis=1).astype(np.float32)
+    quads = np.stack((grid[:-1, :-1].ravel(), grid[:-1, 1:].ravel(),
+                      grid[1:, 1:].ravel(), grid[1:, :-1].ravel()), axis=1)
+    
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.loops.add(n_faces * 4)
+    mesh.loops.foreach_set("vertex_index", quads.ravel().astype(np.int32))
+    mesh.polygons.add(n_faces)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, n_faces * 4, 4, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.full(n_faces, 4, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    
+    rng = np.random.default_rng(0)
+    mesh.polygons.foreach_set("hide", rng.random(n_faces) < hidden_ratio)
+    mesh.polygons.foreach_set("material_index", (np.arange(n_faces) % materials).astype(np.int32))
+    for i in range(materials):
+        mesh.materials.append(bpy.data.materials.new(f"{name}_mat_{i}"))
+    return mesh
+
+
+# シーンに登録されたオブジェクトとメッシュ、ゴーストのキャッシュを全て破棄する
+def reset_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+    gm_draw._draw_objects.clear()
+    gm_draw._shared_batches.clear()
+    gm_draw._merged_cells.clear()
+    bpy.context.scene.ghost_merge_static = False
+    bpy.context.scene.ghost_source = 'EVALUATED'
+    gm_draw.invalidate_snapshot()
+    gm_draw._scene_index.is_valid = False
+    legacy_caches.clear()
+
+
+# 一般的なモディファイアスタック（バッチ共有のシグネチャ作成を計測に含める）
+def make_modifiers():
+    return [
+        bpy.types.Modifier("Mirror", 'MIRROR', use_axis=(True, False, False), mirror_object=None),
+        bpy.types.Modifier("Subdivision", 'SUBSURF', levels=1, render_levels=2, subdivision_type='CATMULL_CLARK'),
+    ]
+
+
+# count 個のオブジェクトを作成し、hidden_ratio の割合を非表示にする
+def make_objects(count, hidden_ratio=0.0, faces=1):
+    scn = bpy.context.scene
+    rng = np.random.default_rng(0)
+    objects = []
+    for i in range(count):
+        obj = bpy.data.objects.new(f"bench_{i}", make_grid_mesh(f"bench_mesh_{i}", faces))
+        obj.modifiers = make_modifiers()
+        scn.collection.objects.link(obj)
+        obj.matrix_world = obj.matrix_world.Translation(rng.uniform(-100.0, 100.0, 3))
+        obj.hide_set(bool(rng.random() < hidden_ratio))
+        objects.append(obj)
+    return objects
+
+
+class FakeUpdate:
+    def __init__(self, id_data):
+        self.id = id_data
+        self.is_updated_geometry = True
+        self.is_updated_transform = False
+
+
+class FakeDepsgraph:
+    def __init__(self, updates):
+        self.updates = updates
+
+
+# 透視投影行列（-Z 方向を向くカメラ）
+def perspective(fov, aspect, near, far):
+    t = 1.0 / math.tan(fov / 2.0)
+    return Matrix((
+        (t / aspect, 0.0, 0.0, 0.0),
+        (0.0, t, 0.0, 0.0),
+        (0.0, 0.0, (far + near) / (near - far), 2.0 * far * near / (near - far)),
+        (0.0, 0.0, -1.0, 0.0)))
+
+
+# 最適化前の実装（*_legacy シナリオで新しい実装と比較する）
+
+# 非表示面を BMesh のループで扇状に三角形分割する編集モードゴーストの生成
+def legacy_edit_build(mesh):
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    verts, indices, edge_verts, edge_exists = [], [], [], set()
+    for face in [f for f in bm.faces if f.hide]:
+        start_idx = len(verts)
+        for loop in face.loops:
+            verts.append(loop.vert.co.to_tuple())
+        for i in range(1, len(face.verts) - 1):
+            indices.append((start_idx, start_idx + i, start_idx + i + 1))
+        for edge in face.edges:
+            if edge.index not in edge_exists:
+                edge_exists.add(edge.index)
+                edge_verts.append(edge.verts[0].co.to_tuple())
+                edge_verts.append(edge.verts[1].co.to_tuple())
+    bm.free()
+    return verts, indices, edge_verts
+
+
+# 評価メッシュを Vector/タプルのリストとして読み込む
+def legacy_object_read(mesh):
+    mesh.calc_loop_triangles()
+    verts = [v.co for v in mesh.vertices]
+    faces = [t.vertices for t in mesh.loop_triangles]
+    edges = [e.vertices for e in mesh.edges]
+    return verts, faces, edges
+
+
+# BMesh でマテリアルの面の表示/非表示を切り替える
+def legacy_display_toggle(mesh, material_index, visible):
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    for v in bm.verts:
+        v.hide = True
+    for e in bm.edges:
+        e.hide = False
+    if visible:
+        for f in bm.faces:
+            if f.material_index == material_index or f.hide == False:
+                f.hide = False
+                for v in f.verts: v.hide = False
+    else:
+        for f in bm.faces:
+            if f.material_index == material_index:
+                f.hide = True
+            elif not f.hide:
+                for v in f.verts: v.hide = False
+    for e in bm.edges:
+        if e.verts[0].hide or e.verts[1].hide:
+            e.hide = True
+    bm.to_mesh(mesh)
+    bm.free()
+
+
+# マテリアル 1 を隠し、マテリアル 2 を隠し、マテリアル 1 を戻す
+def toggle_sequence(toggle, mesh):
+    for material_index, visible in ((1, False), (2, False), (1, True)):
+        toggle(mesh, material_index, visible)
+
+
+def hide_state(mesh):
+    state = []
+    for seq in (mesh.vertices, mesh.edges, mesh.polygons):
+        values = np.empty(len(seq), dtype=bool)
+        seq.foreach_get("hide", values)
+        state.append(values)
+    return state
+
+
+# 名前をキーとするキャッシュ辞書と、メッシュの更新ごとに全オブジェクトを走査するハンドラ
+legacy_caches = {}
+
+
+def legacy_depsgraph_handler(scn, depsgraph):
+    all_names = {obj.name for obj in scn.objects}
+    for name in list(legacy_caches.keys()):
+        if name not in all_names:
+            del legacy_caches[name]
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Mesh):
+            mesh_name = update.id.name
+            for obj in scn.objects:
+                if obj.type == 'MESH' and obj.data.name == mesh_name:
+                    if obj.name in legacy_caches:
+                        legacy_caches[obj.name].is_cache = False
+
+
+# オブジェクト一覧を毎回作り直す同期処理
+def legacy_object_list_sync(scn):
+    scn.mesh_objects.clear()
+    for obj in scn.objects:
+        if obj.type == 'MESH':
+            item = scn.mesh_objects.add()
+            item.name = obj.name
+            item.object_ref = obj
+
+
+# AABB の頂点をオブジェクトごとに投影する視錐台判定
+def legacy_in_view(matrix_world, bound_box, view_proj):
+    for corner in bound_box:
+        clip = view_proj @ (matrix_world @ Vector(corner)).to_4d()
+        if clip.w == 0.0:
+            continue
+        x, y, z = clip.x / clip.w, clip.y / clip.w, clip.z / clip.w
+        if -1.0 <= x <= 1.0 and -1.0 <= y <= 1.0 and -1.0 <= z <= 1.0:
+            return True
+    return False
+
+
+# 各シナリオは準備を行い、(計測する処理, 各回の前処理 or None) を返す
+# 座標のみの更新ではなく形状全体を生成し直すよう、共有バッチを未生成の状態にする
+def force_rebuild(cache):
+    gm_draw._mark_geometry_dirty(cache)
+    shared = gm_draw._shared_batches.get(cache.shared_key)
+    if shared is not None:
+        shared.topology = None
+
+
+def scenario_edit_cache(scn, faces, hidden_ratio, materials):
+    obj = bpy.data.objects.new("bench_edit", make_grid_mesh("bench_edit", faces, hidden_ratio, materials))
+    scn.collection.objects.link(obj)
+    state = {}
+    
+    def prepare():
+        state["cache"] = gm_draw._draw_objectsData()
+    
+    def run():
+        gm_draw.update_mesh_cache(obj, scn, state["cache"])
+    return run, prepare
+
+
+def scenario_edit_cache_legacy(scn, faces, hidden_ratio, materials):
+    mesh = make_grid_mesh("bench_edit", faces, hidden_ratio, materials)
+    return (lambda: legacy_edit_build(mesh)), None
+
+
+# 評価メッシュの配列の読み込みのみ（バッチの生成を含まない）
+def scenario_object_read(scn, faces):
+    mesh = make_grid_mesh("bench_read", faces)
+    return (lambda: gm_draw._read_object_arrays(mesh, True, True)), None
+
+
+def scenario_object_read_legacy(scn, faces):
+    mesh = make_grid_mesh("bench_read", faces)
+    return (lambda: legacy_object_read(mesh)), None
+
+
+def scenario_object_cache(scn, faces, materials):
+    obj = bpy.data.objects.new("bench_object", make_grid_mesh("bench_object", faces, 0.0, materials))
+    obj.modifiers = make_modifiers()
+    scn.collection.objects.link(obj)
+    obj.hide_set(True)
+    cache = gm_draw._draw_objectsData()
+    
+    def prepare():
+        force_rebuild(cache)
+    
+    def run():
+        gm_draw.update_object_cache(obj, scn, cache)
+    return run, prepare
+
+
+# ディスクキャッシュに保存済みの形状を読み込む場合（ファイルを開き直した直後の再生成）
+def scenario_disk_cache(scn, faces, materials):
+    obj = bpy.data.objects.new("bench_disk", make_grid_mesh("bench_disk", faces, 0.0, materials))
+    scn.collection.objects.link(obj)
+    obj.hide_set(True)
+    cache = gm_draw._draw_objectsData()
+    directory = tempfile.mkdtemp(prefix="ghost_mesh_bench_")
+    
+    def prepare():
+        scn.ghost_disk_cache = True
+        scn.ghost_disk_cache_dir = directory
+        force_rebuild(cache)
+    
+    def run():
+        gm_draw.update_object_cache(obj, scn, cache)
+        scn.ghost_disk_cache = False
+    
+    # 計測前に一度生成してディスクキャッシュに保存する
+    prepare()
+    run()
+    return run, prepare
+
+
+# トポロジーが変わらない変形（アーマチュア等）の後の再生成（座標のみの更新）
+def scenario_deform(scn, faces, materials):
+    mesh = make_grid_mesh("bench_deform", faces, 0.0, materials)
+    obj = bpy.data.objects.new("bench_deform", mesh)
+    scn.collection.objects.link(obj)
+    obj.hide_set(True)
+    cache = gm_draw._draw_objectsData()
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    state = {"frame": 0}
+    
+    def prepare():
+        state["frame"] += 1
+        mesh.vertices.foreach_set("co", co + np.float32(0.001 * state["frame"]))
+        gm_draw._mark_geometry_dirty(cache)
+    
+    def run():
+        gm_draw.update_object_cache(obj, scn, cache)
+    
+    # 計測前に一度生成し、以降はトポロジーが同じ形状として扱われるようにする
+    run()
+    return run, prepare
+
+
+# 生成元を PROXY にした場合の生成（元の形状の 1/8 の三角形数の代理形状）
+def scenario_proxy(scn, faces, materials):
+    obj = bpy.data.objects.new("bench_proxy", make_grid_mesh("bench_proxy", faces, 0.0, materials))
+    scn.collection.objects.link(obj)
+    obj.hide_set(True)
+    scn.ghost_source = 'PROXY'
+    scn.ghost_proxy_triangles = max(faces // 4, 256)
+    cache = gm_draw._draw_objectsData()
+    
+    def prepare():
+        force_rebuild(cache)
+    
+    def run():
+        gm_draw.update_object_cache(obj, scn, cache)
+    return run, prepare
+
+
+# 詳細度の段階を含むオブジェクトモードのゴースト形状の生成（GPU バッチ作成は含まない）
+def scenario_lod(scn, faces):
+    arrays = gm_draw._read_object_arrays(make_grid_mesh("bench_lod", faces), True, True)
+    return (lambda: gm_core.build_object_geometry(*arrays, lod_budget=LOD_BUDGET)), None
+
+
+# オブジェクトモードのマテリアル表示切替（属性配列の一括更新）
+def scenario_display_toggle(scn, faces, materials):
+    mesh = make_grid_mesh("bench_toggle", faces, 0.0, materials)
+    return (lambda: toggle_sequence(gm_panel._set_material_hide_arrays, mesh)), None
+
+
+# 従来の BMesh による切替（計測前に結果の非表示フラグが属性配列版と一致することを確認する）
+def scenario_display_toggle_legacy(scn, faces, materials):
+    mesh = make_grid_mesh("bench_toggle", faces, 0.0, materials)
+    expected = make_grid_mesh("bench_toggle_expected", faces, 0.0, materials)
+    toggle_sequence(legacy_display_toggle, mesh)
+    toggle_sequence(gm_panel._set_material_hide_arrays, expected)
+    for a, b in zip(hide_state(mesh), hide_state(expected)):
+        assert (a == b).all(), "hide flags differ from the legacy operator"
+    return (lambda: toggle_sequence(legacy_display_toggle, mesh)), None
+
+
+def scenario_depsgraph(scn, objects, hidden_ratio):
+    created = make_objects(objects, hidden_ratio)
+    for obj in created:
+        gm_draw._draw_objects.get(obj.session_uid)
+    depsgraph = FakeDepsgraph([FakeUpdate(created[-1].data)])
+    gm_draw.depsgraph_update_handler(scn, depsgraph)  # インデックス構築を計測から除外する
+    
+    def run():
+        gm_draw.depsgraph_update_handler(scn, depsgraph)
+    return run, None
+
+
+# シーン外（インスタンス化・リンクされたコレクション内）のオブジェクトが毎フレーム更新される場合
+def scenario_depsgraph_external(scn, objects, hidden_ratio):
+    make_objects(objects, hidden_ratio)
+    external = [bpy.data.objects.new(f"bench_rig_{i}", make_grid_mesh(f"bench_rig_mesh_{i}", 1))
+                for i in range(EXTERNAL_UPDATES)]
+    updates = []
+    for obj in external:
+        update = FakeUpdate(obj)
+        update.is_updated_transform = True
+        updates += [update, FakeUpdate(obj.data)]
+    depsgraph = FakeDepsgraph(updates)
+    gm_draw.depsgraph_update_handler(scn, depsgraph)  # インデックス構築を計測から除外する
+    
+    def run():
+        gm_draw.depsgraph_update_handler(scn, depsgraph)
+    return run, None
+
+
+def scenario_depsgraph_legacy(scn, objects, hidden_ratio):
+    created = make_objects(objects, hidden_ratio)
+    legacy_caches.clear()
+    for obj in created:
+        legacy_caches[obj.name] = gm_draw._draw_objectsData()
+    depsgraph = FakeDepsgraph([FakeUpdate(created[-1].data)])
+    return (lambda: legacy_depsgraph_handler(scn, depsgraph)), None
+
+
+def scenario_object_list(scn, objects):
+    make_objects(objects)
+    gm_prop.update_mesh_object_list(scn)
+    
+    def run():
+        gm_prop.update_mesh_object_list(scn)
+    return run, None
+
+
+# 1 オブジェクトを追加した後の差分同期
+def scenario_object_list_add(scn, objects):
+    mesh = make_objects(objects)[0].data
+    gm_prop.update_mesh_object_list(scn)
+    state = {"count": 0}
+    
+    def prepare():
+        state["count"] += 1
+        scn.collection.objects.link(bpy.data.objects.new(f"bench_extra_{state['count']}", mesh))
+    
+    def run():
+        gm_prop.update_mesh_object_list(scn)
+    return run, prepare
+
+
+def scenario_object_list_legacy(scn, objects):
+    make_objects(objects)
+    return (lambda: legacy_object_list_sync(scn)), None
+
+
+# 原点から -Y 方向を向く透視投影（画角 90 度、near 0.1 / far 1000）
+CULL_NEAR, CULL_FAR = 0.1, 1000.0
+CULL_PROJECTION = Matrix((
+    (1.0, 0.0, 0.0, 0.0),
+    (0.0, 0.0, 1.0, 0.0),
+    (0.0, (CULL_FAR + CULL_NEAR) / (CULL_NEAR - CULL_FAR), 0.0, 2.0 * CULL_FAR * CULL_NEAR / (CULL_NEAR - CULL_FAR)),
+    (0.0, -1.0, 0.0, 0.0)))
+
+UNIT_BOX = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+
+
+# カメラを内包する・頂点が視錐台に入らずにまたぐ AABB 等の判定結果を確認する
+def check_cull_correctness():
+    planes = gm_core.frustum_planes(perspective(math.radians(60.0), 16.0 / 9.0, 0.1, 1000.0))
+    cases = (
+        ("encloses camera", Matrix.Diagonal((50, 50, 50, 1)), True),
+        ("in front", Matrix.Translation((0, 0, -10)), True),
+        ("behind", Matrix.Translation((0, 0, 10)), False),
+        ("straddles, no corner inside", Matrix.Translation((0, 0, -20)) @ Matrix.Diagonal((100, 1, 1, 1)), True),
+        ("off to the side", Matrix.Translation((60, 60, -10)), False),
+    )
+    for label, matrix, expected in cases:
+        bounds = gm_core.world_aabb(matrix, UNIT_BOX)[np.newaxis]
+        assert bool(gm_core.aabbs_in_frustum(bounds, planes)[0]) == expected, f"cull check failed: {label}"
+
+
+def scenario_cull(scn, objects, hidden_ratio):
+    check_cull_correctness()
+    targets = [obj for obj in make_objects(objects, hidden_ratio) if obj.hide_get()]
+    
+    def run():
+        bounds = np.array([gm_core.world_aabb(obj.matrix_world, obj.bound_box) for obj in targets])
+        gm_core.aabbs_in_frustum(bounds, gm_core.frustum_planes(CULL_PROJECTION))
+    return run, None
+
+
+def scenario_cull_legacy(scn, objects, hidden_ratio):
+    targets = [obj for obj in make_objects(objects, hidden_ratio) if obj.hide_get()]
+    
+    def run():
+        [legacy_in_view(obj.matrix_world, obj.bound_box, CULL_PROJECTION) for obj in targets]
+    return run, None
+
+
+# 代替モジュールの射影行列を、make_objects で配置した全オブジェクトが収まる平行投影にする
+# - Blender では描画コールバック外の行列を変更しないため何もしない
+def use_overview_projection():
+    if BACKEND != "fake":
+        return
+    import gpu
+    from mathutils import Matrix
+    scale = 1.0 / 110.0
+    projection = Matrix(np.diag((scale, scale, -scale, 1.0)))
+    gpu.matrix.get_projection_matrix = lambda: projection
+
+
+# 再生成の時間予算で分割される形状の生成が全て終わるまで描画を繰り返す
+def warm_up_draw():
+    for _ in range(1000):
+        gm_draw.invalidate_snapshot()
+        gm_draw.GM_OT_CustomDraw.draw_frame()
+        if all(cache.is_cache for cache in gm_draw._draw_objects.values()):
+            break
+    gm_draw.invalidate_snapshot()
+    gm_draw.GM_OT_CustomDraw.draw_frame()
+
+
+# 四分割表示（4 リージョン）での 1 回の再描画
+# - 1 リージョン目でスナップショットを作成し、残りのリージョンはそれを再利用する
+def scenario_viewports(scn, objects, hidden_ratio):
+    make_objects(objects, hidden_ratio)
+    use_overview_projection()
+    warm_up_draw()  # 形状の生成を計測から除外する
+    
+    def run():
+        gm_draw.invalidate_snapshot()
+        for _ in range(4):
+            gm_draw.GM_OT_CustomDraw.draw_frame()
+    return run, None
+
+
+# 静止オブジェクトの結合を有効にした四分割表示での 1 回の再描画
+def scenario_merged(scn, objects, hidden_ratio):
+    make_objects(objects, hidden_ratio, faces=64)
+    use_overview_projection()
+    scn.ghost_merge_static = True
+    warm_up_draw()  # 形状の生成とセルの結合を計測から除外する
+    
+    def run():
+        gm_draw.invalidate_snapshot()
+        for _ in range(4):
+            gm_draw.GM_OT_CustomDraw.draw_frame()
+    return run, None
+
+
+RUNNERS = {
+    "edit_cache"            : scenario_edit_cache,
+    "edit_cache_legacy"     : scenario_edit_cache_legacy,
+    "object_read"           : scenario_object_read,
+    "object_read_legacy"    : scenario_object_read_legacy,
+    "object_cache"          : scenario_object_cache,
+    "disk_cache"            : scenario_disk_cache,
+    "deform"                : scenario_deform,
+    "proxy"                 : scenario_proxy,
+    "lod"                   : scenario_lod,
+    "display_toggle"        : scenario_display_toggle,
+    "display_toggle_legacy" : scenario_display_toggle_legacy,
+    "depsgraph"             : scenario_depsgraph,
+    "depsgraph_legacy"      : scenario_depsgraph_legacy,
+    "depsgraph_external"    : scenario_depsgraph_external,
+    "object_list"           : scenario_object_list,
+    "object_list_add"       : scenario_object_list_add,
+    "object_list_legacy"    : scenario_object_list_legacy,
+    "cull"                  : scenario_cull,
+    "cull_legacy"           : scenario_cull_legacy,
+    "viewports"             : scenario_viewports,
+    "merged"                : scenario_merged,
+}
+
+
+def measure(run, prepare, repeat):
+    samples = []
+    for _ in range(repeat):
+        if prepare is not None:
+            prepare()
+        t = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - t) * 1000.0)
+    return samples
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# 1 回実行した際のピークメモリ（MB）
+def peak_memory(run, prepare):
+    if prepare is not None:
+        prepare()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+    return peak
+
+
+def result_key(result):
+    return result["scenario"], tuple(sorted(result["params"].items()))
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Ghost Mesh benchmark suite")
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--faces", nargs="+", type=int, default=[10_000, 100_000])
+    parser.add_argument("--hidden-ratio", nargs="+", type=float, default=[0.5])
+    parser.add_argument("--materials", nargs="+", type=int, default=[4])
+    parser.add_argument("--objects", nargs="+", type=int, default=[1_000, 5_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results to a JSON file")
+    parser.add_argument("--compare", help="compare with a previous JSON result")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    ghost_mesh.register()
+    scn = bpy.context.scene
+    scn.ghost_background_build = False  # 生成処理を同期的に計測する
+    scn.object_ghost_display_face = True
+    scn.object_ghost_display_edge = True
+    values = {
+        "faces": args.faces,
+        "hidden_ratio": args.hidden_ratio,
+        "materials": args.materials,
+        "objects": args.objects,
+    }
+    
+    results = []
+    print(f"backend: {BACKEND}")
+    print(f"{'scenario':<22} {'params':<48} {'median ms':>10} {'min ms':>10} {'peak MB':>8}")
+    for scenario in args.scenario:
+        if scenario in BLENDER_ONLY and BACKEND != "blender":
+            print(f"{scenario:<22} (skipped: requires Blender)")
+            continue
+        names = SCENARIOS[scenario]
+        for combo in itertools.product(*(values[name] for name in names)):
+            params = dict(zip(names, combo))
+            reset_scene()
+            run, prepare = RUNNERS[scenario](scn, **params)
+            samples = measure(run, prepare, args.repeat)
+            result = {
+                "scenario": scenario,
+                "params": params,
+                "median_ms": statistics.median(samples),
+                "min_ms": min(samples),
+            }
+            peak = ""
+            if scenario in MEMORY_SCENARIOS:
+                result["peak_mb"] = peak_memory(run, prepare)
+                peak = f"{result['peak_mb']:.1f}"
+            results.append(result)
+            text = " ".join(f"{k}={v}" for k, v in params.items())
+            print(f"{scenario:<22} {text:<48} {result['median_ms']:>10.3f} {result['min_ms']:>10.3f} {peak:>8}")
+    reset_scene()
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"backend": BACKEND, "commit": current_commit(), "results": results}, f, indent=2)
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("backend") != BACKEND:
+            print(f"warning: comparing {BACKEND} results with {baseline.get('backend')} results")
+        previous = {result_key(r): r for r in baseline["results"]}
+        print(f"\ncompared with {baseline.get('commit')}")
+        print(f"{'scenario':<22} {'params':<48} {'before ms':>10} {'after ms':>10} {'ratio':>7}")
+        for result in results:
+            before = previous.get(result_key(result))
+            if before is None:
+                continue
+            text = " ".join(f"{k}={v}" for k, v in result["params"].items())
+            ratio = result["median_ms"] / max(before["median_ms"], 1e-9)
+            print(f"{result['scenario']:<22} {text:<48} {before['median_ms']:>10.3f} "
+                  f"{result['median_ms']:>10.3f} {ratio:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,17 +13,26 @@ from . import gm_prop
 from . import gm_panel
 from . import gm_draw
 from . import gm_dict
+from . import gm_jobs
+from . import gm_schedule
+from . import gm_stats
 
 # 登録処理
 def register():
     gm_prop.register()
     gm_panel.register()
     gm_draw.register()
+    gm_jobs.register()
+    gm_schedule.register()
+    gm_stats.register()
     bpy.app.translations.register(__name__, gm_dict.translation_dict)
 
 # 解除処理
 def unregister():
     bpy.app.translations.unregister(__name__)
+    gm_stats.unregister()
+    gm_schedule.unregister()
+    gm_jobs.unregister()
     gm_draw.unregister()
     gm_panel.unregister()
     gm_prop.unregister()
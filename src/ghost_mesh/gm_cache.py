@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+# オブジェクトの識別子（session_uid）をキーに描画キャッシュを保持するレジストリ
+# - 名前変更・アンドゥ・他シーンへのリンクでキーが変わらず、キャッシュをそのまま引き継げる
+# - 最後に描画された順（LRU）を保持し、メモリ上限を超えた場合は
+#   今回描画していないキャッシュから古い順に破棄する
+# - ヒット/ミス/破棄の回数と保持バイト数を集計する
+#   （ヒット/ミスは取得時ではなく、生成済みのバッチを再利用した・再生成した時に record で記録する）
+# - 保持バイト数はキャッシュの生成・解放時に add_bytes で増減させ、描画ごとに全キャッシュを集計しない
+class CacheRegistry:
+    def __init__(self, factory, release, nbytes):
+        self._entries  = OrderedDict()
+        self._factory  = factory  # 新しいキャッシュを作成する関数
+        self._release  = release  # 破棄するキャッシュの GPU 資源を解放する関数（解放したバイト数は add_bytes で減らす）
+        self._nbytes   = nbytes   # キャッシュが保持するバイト数を返す関数（破棄の対象を選ぶ時のみ使う）
+        self._bytes    = 0
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, uid):
+        return uid in self._entries
+    
+    def keys(self):
+        return self._entries.keys()
+    
+    def values(self):
+        return self._entries.values()
+    
+    # キャッシュを取得し、無い場合は新しく作成する
+    def get(self, uid):
+        entry = self._entries.get(uid)
+        if entry is None:
+            entry = self._entries[uid] = self._factory()
+        return entry
+    
+    # 生成済みのバッチを再利用した（hit）・再生成が必要だった（miss）ことを記録する
+    def record(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+    
+    # LRU 順を変えずにキャッシュを参照する（無い場合は None）
+    def peek(self, uid):
+        return self._entries.get(uid)
+    
+    # 描画したキャッシュを LRU の末尾（最も新しい位置）に移動する
+    def touch(self, uid):
+        if uid in self._entries:
+            self._entries.move_to_end(uid)
+    
+    # キャッシュを破棄する
+    def remove(self, uid):
+        entry = self._entries.pop(uid, None)
+        if entry is not None:
+            self._release(entry)
+    
+    # 全キャッシュを破棄する
+    def clear(self):
+        for uid in list(self._entries):
+            self.remove(uid)
+    
+    # キャッシュが GPU 資源を確保・解放した際に保持バイト数を増減させる
+    def add_bytes(self, delta):
+        self._bytes += delta
+    
+    def bytes_held(self):
+        return int(self._bytes)
+    
+    # 保持バイト数が limit 以下になるまで、keep に含まれないキャッシュを古い順に破棄する
+    # - keep は上限を超えた場合のみ呼び出す、保持するキー集合を返す関数
+    # - GPU 資源を保持していないキャッシュは破棄しても空きが増えないため残す
+    # - 破棄したキャッシュの数を返す
+    def evict(self, limit, keep):
+        if self._bytes <= limit:
+            return 0
+        keep = keep()
+        evicted = 0
+        for uid in list(self._entries):
+            if self._bytes <= limit:
+                break
+            if uid in keep or not self._nbytes(self._entries[uid]):
+                continue
+            self.remove(uid)
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+    
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self.bytes_held(),
+        }
@@ -0,0 +1,363 @@
+import zlib
+import numpy as np
+
+# ゴースト形状の生成・カリングに使う NumPy のみの処理
+# - bpy/gpu に依存せず、配列を受け取って GPU へ転送できる頂点・インデックス配列を返す
+# - gm_draw はメッシュからの配列の読み込みとバッチの作成のみを行う
+
+# マテリアルスロット単位で除外・色分けできるスロット数（ビットマスク 2 × 32bit）
+# - これ以上のスロットは常に描画し、単色で表示する
+MASK_SLOTS = 64
+
+# 編集モードのゴーストを分割する 1 チャンクあたりの面数
+EDIT_CHUNK_FACES = 16384
+
+# オブジェクトモードのゴーストに作成する簡略化段階の最大数と、各段階の三角形数の比
+# - 最も粗い段階でも LOD_MIN_TRIANGLES 程度の三角形を残す
+LOD_LEVELS = 4
+LOD_STEP = 0.25
+LOD_MIN_TRIANGLES = 256
+
+# ローカル座標のバウンディングボックスからワールド座標の AABB を計算する
+# - 戻り値は (min x, min y, min z, max x, max y, max z)
+def world_aabb(matrix_world, bound_box):
+    matrix = np.array(matrix_world, dtype=np.float64)
+    corners = np.array(bound_box, dtype=np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
+    return np.concatenate((corners.min(axis=0), corners.max(axis=0)))
+
+# ビュー射影行列から視錐台の 6 平面 (a, b, c, d) を取り出す
+# - 平面の表側（ax + by + cz + d >= 0）が視錐台の内側になる
+def frustum_planes(view_proj):
+    m = np.array(view_proj, dtype=np.float64)
+    return np.stack((m[3] + m[0], m[3] - m[0],
+                     m[3] + m[1], m[3] - m[1],
+                     m[3] + m[2], m[3] - m[2]))
+
+# 複数の AABB を視錐台の 6 平面に対して一括判定する
+# - いずれかの平面の完全に外側にある AABB のみ False とするため、
+#   視錐台をまたぐ・カメラを内包する大きなオブジェクトも描画対象に残る
+def aabbs_in_frustum(bounds, planes):
+    centers = (bounds[:, :3] + bounds[:, 3:]) * 0.5
+    extents = (bounds[:, 3:] - bounds[:, :3]) * 0.5
+    dist = centers @ planes[:, :3].T + planes[:, 3]
+    radius = extents @ np.abs(planes[:, :3]).T
+    return np.all(dist + radius >= 0.0, axis=1)
+
+# 複数の AABB が画面に占める大きさを一括計算する
+# - AABB の外接球の半径を画面の半分の高さに対する比で返す（1 でおおよそ画面全体）
+# - カメラが外接球の内側にある場合は無限大とする
+def projected_sizes(bounds, view_proj):
+    m = np.array(view_proj, dtype=np.float64)
+    centers = (bounds[:, :3] + bounds[:, 3:]) * 0.5
+    radius = np.linalg.norm(bounds[:, 3:] - bounds[:, :3], axis=1) * 0.5
+    w = centers @ m[3, :3] + m[3, 3]
+    # 透視投影では w が視点からの距離、平行投影では w = 1 となる
+    perspective = abs(m[3, 2]) > 1e-6
+    near = w <= radius if perspective else np.zeros(len(w), dtype=bool)
+    sizes = radius * abs(m[1, 1]) / np.maximum(w, 1e-6)
+    sizes[near] = np.inf
+    return sizes
+
+# 除外フラグの配列から半透明描画を除外するスロットのビットマスク (下位 32 スロット, 上位 32 スロット) を返す
+# - スロット数を超える material_index は最後のスロットとして扱う
+# - GLSL の int（符号付き 32bit）として渡せる値に変換する
+def slot_mask_bits(excluded):
+    if excluded is None:
+        return 0, 0
+    slots = np.minimum(np.arange(MASK_SLOTS), len(excluded) - 1)
+    bits = excluded[slots].astype(np.uint64) << np.arange(MASK_SLOTS, dtype=np.uint64)
+    mask = int(np.bitwise_or.reduce(bits))
+    lo, hi = mask & 0xFFFFFFFF, mask >> 32
+    return (lo - (1 << 32) if lo >= (1 << 31) else lo,
+            hi - (1 << 32) if hi >= (1 << 31) else hi)
+
+# 連続した範囲 [starts[i], starts[i] + counts[i]) を連結したインデックス配列を返す
+def concat_ranges(starts, counts):
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.cumsum(counts) - counts
+    return np.repeat(starts - offsets, counts) + np.arange(total)
+
+# 非表示かつ半透明描画から除外されていない面のインデックスをブールマスクで抽出する
+def ghost_faces(arrays, excluded):
+    mask = arrays["hide"]
+    if excluded is not None and excluded.any():
+        slot = np.minimum(arrays["mat_index"], len(excluded) - 1)
+        mask = mask & ~excluded[slot]
+    return np.flatnonzero(mask)
+
+# 配列の内容からチャンクのハッシュ値を計算する（None とそれ以外を区別する）
+def chunk_hash(*arrays):
+    value = 0
+    for array in arrays:
+        value = zlib.crc32(b"-" if array is None else array.tobytes(), value)
+    return value
+
+# 非表示面から編集モードのゴースト形状をチャンク単位で生成する
+# - 面は面インデックスを chunk_faces ごとに区切ったチャンクに属し、
+#   三角形分割はメッシュの loop_triangles（凹多角形も正しく分割される）を使用する
+# - 頂点はチャンク内で (頂点, マテリアルスロット) の組ごとに 1 つだけ作成し、
+#   面・辺のバッチは同じ頂点配列をインデックスで参照する
+# - 辺は (辺, マテリアルスロット) の組で重複を除いた上で最初に現れる面のチャンクに割り当てる
+#   （異なるマテリアルの境界の辺は、どちらのスロットが除外されても描画できるよう両方に残す）
+# - excluded を渡した場合は除外マテリアルの面を生成時に取り除く（シェーダーでマスクできない環境用）
+# - 戻り値は {チャンク番号: (ハッシュ, 頂点座標, 頂点スロット, 三角形インデックス or None, 辺インデックス or None, 元の頂点番号)}
+#   （元の頂点番号は形状の変形時に座標のみを更新するために使う）
+# - ハッシュは (頂点座標のハッシュ値, それ以外の配列のハッシュ値)。座標のみを更新した場合は前者だけを計算し直す
+def build_edit_chunks(arrays, excluded, show_face, show_edge, chunk_faces=EDIT_CHUNK_FACES):
+    faces = ghost_faces(arrays, excluded)
+    chunks = {}
+    if len(faces) == 0 or not (show_face or show_edge):
+        return chunks
+    
+    co, mat_index = arrays["co"], arrays["mat_index"]
+    n_vert = len(co)
+    n_slots = int(mat_index.max()) + 1
+    # (チャンク, 頂点, スロット) を一つの整数キーにまとめる（チャンクが最上位のためチャンクごとに連続する）
+    def vertex_keys(chunk, vert, slot):
+        return (chunk.astype(np.int64) * n_vert + vert) * n_slots + slot
+    
+    keys = []
+    if show_face:
+        selected = np.zeros(len(mat_index), dtype=bool)
+        selected[faces] = True
+        tris = np.flatnonzero(selected[arrays["tri_poly"]])
+        tri_poly = arrays["tri_poly"][tris]
+        tri_chunk = tri_poly // chunk_faces
+        order = np.argsort(tri_chunk, kind="stable")
+        tri_poly, tri_chunk = tri_poly[order], tri_chunk[order]
+        tri_keys = vertex_keys(np.repeat(tri_chunk, 3), arrays["tri_verts"][tris[order]].ravel(),
+                               np.repeat(mat_index[tri_poly], 3))
+        keys.append(tri_keys)
+    
+    if show_edge:
+        totals = arrays["loop_total"][faces]
+        loops = concat_ranges(arrays["loop_start"][faces], totals)
+        loop_slot = np.repeat(mat_index[faces], totals)
+        edge_ids, first = np.unique(arrays["loop_edge"][loops].astype(np.int64) * n_slots + loop_slot, return_index=True)
+        edges, edge_slots = edge_ids // n_slots, edge_ids % n_slots
+        edge_chunk = np.repeat(faces // chunk_faces, totals)[first]
+        order = np.argsort(edge_chunk, kind="stable")
+        edges, edge_slots, edge_chunk = edges[order], edge_slots[order], edge_chunk[order]
+        edge_keys = vertex_keys(np.repeat(edge_chunk, 2), arrays["edge_verts"][edges].ravel(),
+                                np.repeat(edge_slots, 2))
+        keys.append(edge_keys)
+    
+    # 全チャンクの頂点キーを一括で重複除去し、チャンクごとの頂点番号に振り直す
+    unique_keys = np.unique(np.concatenate(keys))
+    key_chunk = unique_keys // (n_vert * n_slots)
+    chunk_ids, vert_lo = np.unique(key_chunk, return_index=True)
+    vert_hi = np.append(vert_lo[1:], len(unique_keys))
+    sources = ((unique_keys // n_slots) % n_vert).astype(np.int32)
+    positions = co[sources]
+    slots = (unique_keys % n_slots).astype(np.float32)
+    
+    if show_face:
+        tri_index = np.searchsorted(unique_keys, tri_keys).reshape(-1, 3)
+        tri_lo = np.searchsorted(tri_chunk, chunk_ids, side="left")
+        tri_hi = np.searchsorted(tri_chunk, chunk_ids, side="right")
+    if show_edge:
+        edge_index = np.searchsorted(unique_keys, edge_keys).reshape(-1, 2)
+        edge_lo = np.searchsorted(edge_chunk, chunk_ids, side="left")
+        edge_hi = np.searchsorted(edge_chunk, chunk_ids, side="right")
+    
+    for i, chunk_id in enumerate(chunk_ids):
+        base = vert_lo[i]
+        chunk_pos = positions[base:vert_hi[i]]
+        chunk_slot = slots[base:vert_hi[i]]
+        chunk_tris = chunk_edges = None
+        if show_face and tri_hi[i] > tri_lo[i]:
+            chunk_tris = (tri_index[tri_lo[i]:tri_hi[i]] - base).astype(np.int32)
+        if show_edge and edge_hi[i] > edge_lo[i]:
+            chunk_edges = (edge_index[edge_lo[i]:edge_hi[i]] - base).astype(np.int32)
+        digest = (chunk_hash(chunk_pos), chunk_hash(chunk_slot, chunk_tris, chunk_edges))
+        chunks[int(chunk_id)] = (digest, chunk_pos, chunk_slot, chunk_tris, chunk_edges, sources[base:vert_hi[i]])
+    return chunks
+
+# AABB の中心が属する格子セルの番号 (x, y, z) を返す
+def cell_indices(bounds, cell_size):
+    centers = (bounds[:, :3] + bounds[:, 3:]) * 0.5
+    return np.floor(centers / cell_size).astype(np.int64)
+
+# 複数オブジェクトの形状をワールド座標に変換して 1 つの形状にまとめる
+# - parts は (頂点座標, スロット番号 or None, 三角形 or None, 辺 or None, 4x4 ワールド行列) の一覧
+# - スロット番号はすべての形状が持つ場合のみ結合する
+# - 戻り値は (頂点座標, スロット番号 or None, 三角形 or None, 辺 or None)
+def merge_geometry(parts):
+    positions, slots, tris, edges = [], [], [], []
+    offset = 0
+    for co, vert_slots, part_tris, part_edges, matrix in parts:
+        matrix = np.asarray(matrix, dtype=np.float32)
+        positions.append(co @ matrix[:3, :3].T + matrix[:3, 3])
+        slots.append(vert_slots)
+        if part_tris is not None:
+            tris.append(part_tris + offset)
+        if part_edges is not None:
+            edges.append(part_edges + offset)
+        offset += len(co)
+    if not positions:
+        return np.empty((0, 3), dtype=np.float32), None, None, None
+    return (np.concatenate(positions).astype(np.float32),
+            np.concatenate(slots) if all(array is not None for array in slots) else None,
+            np.concatenate(tris).astype(np.int32) if tris else None,
+            np.concatenate(edges).astype(np.int32) if edges else None)
+
+# 輪郭や形状の把握に必要な辺（特徴辺）のみを抽出する
+# - 境界辺（隣接面 1）、非多様体辺（隣接面 3 以上）、面を持たない辺、
+#   隣接する 2 面の法線のなす角が feature_angle を超える辺を残す
+def feature_edges(edges, normals, loop_total, loop_edge, feature_angle):
+    loop_poly = np.repeat(np.arange(len(loop_total)), loop_total)
+    counts = np.bincount(loop_edge, minlength=len(edges))
+    keep = counts != 2
+    
+    # 辺番号順に並べたループから、隣接面がちょうど 2 つの辺の面の組を取り出す
+    order = np.argsort(loop_edge, kind='stable')
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    manifold = np.flatnonzero(counts == 2)
+    poly_a = loop_poly[order[starts[manifold]]]
+    poly_b = loop_poly[order[starts[manifold] + 1]]
+    cosine = np.einsum('ij,ij->i', normals[poly_a], normals[poly_b])
+    keep[manifold[cosine < np.cos(feature_angle)]] = True
+    return edges[keep]
+
+# 頂点を (頂点, スロット) の組ごとに複製し、三角形・辺のインデックスを振り直す
+# - マテリアル境界の頂点はスロットごとに別頂点となり、面の色が混ざらない
+# - 辺は各頂点の最初の複製を参照し、面を持たない頂点は色分けしないスロット（MASK_SLOTS）で末尾に追加する
+# - 戻り値は (頂点座標, 頂点スロット, 三角形, 辺, 元の頂点番号)
+def split_by_slot(co, tris, tri_slots, edges):
+    stride = MASK_SLOTS + 1
+    slots = np.repeat(np.clip(tri_slots, 0, MASK_SLOTS), 3).astype(np.int64)
+    keys, inverse = np.unique(tris.ravel().astype(np.int64) * stride + slots, return_inverse=True)
+    verts = keys // stride
+    positions = co[verts]
+    vert_slots = (keys % stride).astype(np.float32)
+    tris = inverse.astype(np.int32).reshape(-1, 3)
+    
+    if edges is not None:
+        first = np.full(len(co), -1, dtype=np.int64)
+        used, index = np.unique(verts, return_index=True)
+        first[used] = index
+        loose = np.unique(edges.ravel())
+        loose = loose[first[loose] < 0]
+        first[loose] = len(keys) + np.arange(len(loose))
+        verts = np.concatenate((verts, loose))
+        positions = co[verts]
+        vert_slots = np.concatenate((vert_slots, np.full(len(loose), MASK_SLOTS, dtype=np.float32)))
+        edges = first[edges].astype(np.int32)
+    return positions, vert_slots, tris, edges, verts.astype(np.int32)
+
+# 行の値が同じものを一つにまとめ、最初に現れた行のインデックスを昇順で返す
+def unique_rows(rows):
+    order = np.lexsort(rows.T[::-1])
+    ordered = rows[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = np.any(ordered[1:] != ordered[:-1], axis=1)
+    return np.sort(order[first])
+
+# 頂点をクラスタ（remap が同じ頂点）ごとの平均位置にまとめる
+def cluster_positions(co, remap, count):
+    counts = np.maximum(np.bincount(remap, minlength=count), 1)
+    positions = np.empty((count, 3), dtype=np.float32)
+    for axis in range(3):
+        positions[:, axis] = np.bincount(remap, weights=co[:, axis], minlength=count) / counts
+    return positions
+
+# 頂点クラスタリングでメッシュを簡略化する
+# - バウンディングボックスを resolution^3 の格子に分割し、同じセルの頂点を平均位置の 1 頂点にまとめる
+# - 潰れた三角形・辺を除き、重複した三角形・辺は一つにまとめる
+# - 戻り値の remap は元の頂点ごとのクラスタ番号
+def cluster_vertices(co, tris, edges, tri_slots, resolution):
+    lo = co.min(axis=0)
+    size = np.maximum((co.max(axis=0) - lo) / resolution, 1e-9)
+    cell = np.minimum(((co - lo) / size).astype(np.int64), resolution - 1)
+    keys = (cell[:, 0] * resolution + cell[:, 1]) * resolution + cell[:, 2]
+    cells, remap = np.unique(keys, return_inverse=True)
+    remap = remap.ravel()
+    positions = cluster_positions(co, remap, len(cells))
+    
+    if tris is not None:
+        tris = remap[tris]
+        keep = (tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 2] != tris[:, 0])
+        tris = tris[keep]
+        if tri_slots is not None:
+            tri_slots = tri_slots[keep]
+        # 頂点の組とスロットが同じ三角形は一つだけ残す（向きは最初の三角形のものを使う）
+        ident = np.sort(tris, axis=1)
+        if tri_slots is not None:
+            ident = np.column_stack((ident, tri_slots))
+        first = unique_rows(ident)
+        tris = tris[first].astype(np.int32)
+        if tri_slots is not None:
+            tri_slots = tri_slots[first]
+    if edges is not None:
+        edges = np.sort(remap[edges], axis=1)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        edges = edges[unique_rows(edges)].astype(np.int32)
+    return positions, tris, edges, tri_slots, remap.astype(np.int32)
+
+# 形状から表示用の配列 (頂点座標, スロット番号 or None, 三角形, 辺, 座標の参照元) を作成する
+# - 空の三角形・辺は None として扱う
+# - tri_slots がある場合はマテリアル色用に頂点をスロットごとに分割する
+# - 座標の参照元 (クラスタ番号 or None, 頂点番号 or None) は level_positions で変形後の座標を求めるために使う
+def object_level(co, tris, edges, tri_slots, remap=None):
+    if tris is not None and len(tris) == 0:
+        tris = None
+    if edges is not None and len(edges) == 0:
+        edges = None
+    if tris is not None and tri_slots is not None:
+        positions, slots, tris, edges, verts = split_by_slot(co, tris, tri_slots, edges)
+        return positions, slots, tris, edges, (remap, verts)
+    return co, None, tris, edges, (remap, None)
+
+# 元の形状の頂点座標から、段階の頂点座標を求める（トポロジーが同じ変形後の形状の座標更新用）
+def level_positions(co, source):
+    remap, verts = source
+    if remap is not None:
+        co = cluster_positions(co, remap, int(remap.max()) + 1 if len(remap) else 0)
+    if verts is not None:
+        co = co[verts]
+    return co
+
+# オブジェクトモードのゴースト形状を詳細度の段階ごとに作成する（ワーカースレッドで実行）
+# - features を指定した場合は辺を特徴辺のみに絞り込む（簡略化形状にも引き継がれる）
+# - 先頭が元の形状で、lod_budget を指定した場合は三角形数が lod_budget から
+#   LOD_STEP 倍ずつ少なくなる簡略化形状を続けて作成する
+# - max_triangles を指定した場合は三角形数が max_triangles を超える段階を取り除き、
+#   先頭を簡略化形状（代理形状）にする（座標の更新は元の形状の頂点から引き続き行える）
+def build_object_geometry(co, tris, edges, tri_slots=None, features=None, feature_angle=None, lod_budget=0,
+                          max_triangles=0):
+    if edges is not None and features is not None:
+        edges = feature_edges(edges, *features, feature_angle)
+    levels = [object_level(co, tris, edges, tri_slots)]
+    if max_triangles and tris is not None and len(tris) > max_triangles:
+        lod_budget = min(lod_budget, max_triangles) if lod_budget else max_triangles
+    else:
+        max_triangles = 0
+    if not lod_budget or tris is None or len(co) == 0:
+        return levels
+    
+    # 三角形数は格子の解像度の 2 乗におおよそ比例するため、
+    # 前の段階の結果から次の解像度を見積もる（初回は 1 セルあたり 2 三角形と仮定）
+    # - 代理形状を作る場合は元の形状との差が小さくても簡略化する
+    target = float(lod_budget)
+    resolution = tri_count = None
+    while len(levels) <= LOD_LEVELS and target >= LOD_MIN_TRIANGLES:
+        if target < len(tris) * (1.0 if max_triangles else 0.5):
+            if resolution is None:
+                resolution = np.sqrt(target * 0.5)
+            else:
+                resolution *= np.sqrt(target / max(tri_count, 1))
+            level = cluster_vertices(co, tris, edges, tri_slots, max(int(resolution), 2))
+            tri_count = len(level[1])
+            if tri_count > target * 1.5 and len(levels) == 1:
+                # 初回の見積もりが大きく外れた場合は一度だけ解像度を補正して作り直す
+                resolution *= np.sqrt(target / tri_count)
+                level = cluster_vertices(co, tris, edges, tri_slots, max(int(resolution), 2))
+                tri_count = len(level[1])
+            levels.append(object_level(*level))
+        target *= LOD_STEP
+    if max_triangles:
+        while len(levels) > 1 and levels[0][2] is not None and len(levels[0][2]) > max_triangles:
+            levels.pop(0)
+    return levels
@@ -21,6 +21,49 @@ translation_dict = {
         ("*", "Display hidden faces as translucent") : "Display hidden faces as translucent",
         ("*", "Hidden edge color") : "Hidden edge color",
         ("*", "Hidden surface color") : "Hidden surface color",
+        ("*", "Ghost color") : "Ghost color",
+        ("*", "How ghost faces are colored") : "How ghost faces are colored",
+        ("*", "Object Edge mode") : "Object Edge mode",
+        ("*", "Which edges of hidden objects are drawn") : "Which edges of hidden objects are drawn",
+        ("*", "Feature angle") : "Feature angle",
+        ("*", "Edges whose adjacent faces meet at a larger angle are drawn as feature edges") : "Edges whose adjacent faces meet at a larger angle are drawn as feature edges",
+        ("*", "Cache limit (MB)") : "Cache limit (MB)",
+        ("*", "GPU memory kept for ghost caches; caches of objects off screen are released first when exceeded") : "GPU memory kept for ghost caches; caches of objects off screen are released first when exceeded",
+        ("*", "Ghost cache") : "Ghost cache",
+        ("*", "Disk cache") : "Disk cache",
+        ("*", "Keep built ghost geometry on disk so reopened files skip rebuilding unchanged meshes") : "Keep built ghost geometry on disk so reopened files skip rebuilding unchanged meshes",
+        ("*", "Disk cache folder") : "Disk cache folder",
+        ("*", "Folder for the ghost disk cache; the system temporary folder is used when empty") : "Folder for the ghost disk cache; the system temporary folder is used when empty",
+        ("*", "Disk cache limit (MB)") : "Disk cache limit (MB)",
+        ("*", "Disk space kept for the ghost disk cache; least recently used entries are deleted first when exceeded") : "Disk space kept for the ghost disk cache; least recently used entries are deleted first when exceeded",
+        ("*", "Instrumentation") : "Instrumentation",
+        ("*", "Measure time spent in each ghost rendering stage") : "Measure time spent in each ghost rendering stage",
+        ("*", "Show HUD") : "Show HUD",
+        ("*", "Show ghost rendering time in the 3D viewport") : "Show ghost rendering time in the 3D viewport",
+        ("*", "Export ghost stats") : "Export ghost stats",
+        ("*", "Write ghost rendering timings and counters to a JSON file") : "Write ghost rendering timings and counters to a JSON file",
+        ("*", "Batched drawing") : "Batched drawing",
+        ("*", "Merge static objects") : "Merge static objects",
+        ("*", "Bake hidden objects that stay still into one world-space batch per grid cell") : "Bake hidden objects that stay still into one world-space batch per grid cell",
+        ("*", "Cell size") : "Cell size",
+        ("*", "Size of the grid cells that static hidden objects are merged into") : "Size of the grid cells that static hidden objects are merged into",
+        ("*", "Merged cells") : "Merged cells",
+        ("*", "Ghost source") : "Ghost source",
+        ("*", "Which mesh hidden objects' ghosts are built from") : "Which mesh hidden objects' ghosts are built from",
+        ("*", "Object ghost source") : "Object ghost source",
+        ("*", "Which mesh this object's ghost is built from") : "Which mesh this object's ghost is built from",
+        ("*", "Proxy triangles") : "Proxy triangles",
+        ("*", "Maximum triangles kept in a proxy ghost") : "Maximum triangles kept in a proxy ghost",
+        ("*", "Level of detail") : "Level of detail",
+        ("*", "Draw simplified ghosts for hidden objects that are small on screen or very dense") : "Draw simplified ghosts for hidden objects that are small on screen or very dense",
+        ("*", "Triangle budget") : "Triangle budget",
+        ("*", "Maximum triangles drawn for a hidden object that fills the view") : "Maximum triangles drawn for a hidden object that fills the view",
+        ("*", "Draw hidden objects that share geometry together in one call") : "Draw hidden objects that share geometry together in one call",
+        ("*", "Background build") : "Background build",
+        ("*", "Rebuild budget (ms)") : "Rebuild budget (ms)",
+        ("*", "Time per redraw spent rebuilding ghosts; remaining objects are rebuilt on later redraws") : "Time per redraw spent rebuilding ghosts; remaining objects are rebuilt on later redraws",
+        ("*", "Rebuilding ghosts") : "Rebuilding ghosts",
+        ("*", "Build ghost geometry in worker threads and keep showing the previous ghost until it is ready") : "Build ghost geometry in worker threads and keep showing the previous ghost until it is ready",
     },
     "ja_JP": {
         ("*", "Mesh display/hide") : "メッシュ表示／非表示",
@@ -47,6 +90,49 @@ translation_dict = {
         ("*", "Display hidden faces as translucent") : "隠れた面を半透明で表示する",
         ("*", "Hidden edge color") : "隠れた辺の色",
         ("*", "Hidden surface color") : "隠れた面の色",
+        ("*", "Ghost color") : "ゴーストの色",
+        ("*", "How ghost faces are colored") : "ゴーストの面の色の決め方",
+        ("*", "Object Edge mode") : "オブジェクトの辺の表示",
+        ("*", "Which edges of hidden objects are drawn") : "非表示オブジェクトのどの辺を描画するか",
+        ("*", "Feature angle") : "特徴辺の角度",
+        ("*", "Edges whose adjacent faces meet at a larger angle are drawn as feature edges") : "隣接する面のなす角がこれより大きい辺を特徴辺として描画する",
+        ("*", "Cache limit (MB)") : "キャッシュ上限 (MB)",
+        ("*", "GPU memory kept for ghost caches; caches of objects off screen are released first when exceeded") : "ゴーストのキャッシュに使う GPU メモリの上限（超えた場合は画面外のオブジェクトから解放する）",
+        ("*", "Ghost cache") : "ゴーストキャッシュ",
+        ("*", "Disk cache") : "ディスクキャッシュ",
+        ("*", "Keep built ghost geometry on disk so reopened files skip rebuilding unchanged meshes") : "生成したゴースト形状をディスクに保存し、ファイルを開き直した時に変更のないメッシュの再生成を省略する",
+        ("*", "Disk cache folder") : "ディスクキャッシュの保存先",
+        ("*", "Folder for the ghost disk cache; the system temporary folder is used when empty") : "ディスクキャッシュを保存するフォルダ（空の場合はシステムの一時フォルダ）",
+        ("*", "Disk cache limit (MB)") : "ディスクキャッシュ上限 (MB)",
+        ("*", "Disk space kept for the ghost disk cache; least recently used entries are deleted first when exceeded") : "ディスクキャッシュに使う容量の上限（超えた場合は最後に使用した日時の古いものから削除する）",
+        ("*", "Instrumentation") : "処理時間の計測",
+        ("*", "Measure time spent in each ghost rendering stage") : "ゴースト描画の各段階の処理時間を計測する",
+        ("*", "Show HUD") : "HUD を表示",
+        ("*", "Show ghost rendering time in the 3D viewport") : "ゴースト描画の処理時間を 3D ビューポートに表示する",
+        ("*", "Export ghost stats") : "ゴースト統計の書き出し",
+        ("*", "Write ghost rendering timings and counters to a JSON file") : "ゴースト描画の処理時間とカウンタを JSON ファイルに書き出す",
+        ("*", "Batched drawing") : "一括描画",
+        ("*", "Merge static objects") : "静止オブジェクトの結合",
+        ("*", "Bake hidden objects that stay still into one world-space batch per grid cell") : "動かない非表示オブジェクトを格子セルごとにワールド座標の一つのバッチにまとめる",
+        ("*", "Cell size") : "セルのサイズ",
+        ("*", "Size of the grid cells that static hidden objects are merged into") : "静止した非表示オブジェクトをまとめる格子セルの大きさ",
+        ("*", "Merged cells") : "結合セル",
+        ("*", "Ghost source") : "ゴーストの生成元",
+        ("*", "Which mesh hidden objects' ghosts are built from") : "非表示オブジェクトのゴーストをどのメッシュから作成するか",
+        ("*", "Object ghost source") : "オブジェクトのゴーストの生成元",
+        ("*", "Which mesh this object's ghost is built from") : "このオブジェクトのゴーストをどのメッシュから作成するか",
+        ("*", "Proxy triangles") : "代理形状の三角形数",
+        ("*", "Maximum triangles kept in a proxy ghost") : "代理形状のゴーストに残す三角形数の上限",
+        ("*", "Level of detail") : "詳細度の切り替え",
+        ("*", "Draw simplified ghosts for hidden objects that are small on screen or very dense") : "画面上で小さい、または非常に高密度な非表示オブジェクトを簡略化して描画する",
+        ("*", "Triangle budget") : "三角形数の上限",
+        ("*", "Maximum triangles drawn for a hidden object that fills the view") : "画面全体に映る非表示オブジェクトに描画する三角形数の上限",
+        ("*", "Draw hidden objects that share geometry together in one call") : "同じ形状を持つ非表示オブジェクトをまとめて描画する",
+        ("*", "Background build") : "バックグラウンド生成",
+        ("*", "Rebuild budget (ms)") : "再生成の時間予算 (ms)",
+        ("*", "Time per redraw spent rebuilding ghosts; remaining objects are rebuilt on later redraws") : "1 回の再描画でゴーストの再生成に使う時間。残りは以降の再描画で処理する",
+        ("*", "Rebuilding ghosts") : "ゴーストを再生成中",
+        ("*", "Build ghost geometry in worker threads and keep showing the previous ghost until it is ready") : "ゴーストをワーカースレッドで生成し、完了するまで以前のゴーストを表示する",
     }
 }
 
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import numpy as np
+
+# ゴースト形状（生成済みの頂点・インデックス配列）をディスクに保存し、ファイルを開き直した時に再利用する
+# - オブジェクトモードのゴースト形状のみを対象とする（編集モードは編集のたびに内容が変わるため保存しない）
+# - キーは生成関数と入力配列（評価後の形状・マテリアルスロット・特徴辺の設定等）の内容から計算したハッシュ値
+# - 1 エントリを 1 ファイルとし、配列はメモリマップで読み込んでそのまま GPU バッファへ転送する
+# - bpy に依存せず、ワーカースレッドから呼び出せる
+
+# ファイルの構成: MAGIC, ヘッダー長 (uint32), ヘッダー (JSON), 配列データ
+# - 配列のオフセットはヘッダー直後（ALIGN に切り上げた位置）からの相対位置とする
+
+# ファイル形式の識別子（形式や生成処理の結果が変わる場合は番号を上げて古いエントリを無効にする）
+MAGIC = b"GMC2"
+
+# エントリファイルの拡張子
+EXTENSION = ".gmc"
+
+# 配列データの先頭位置のアライメント（バイト）
+ALIGN = 64
+
+# 既定の保存先ディレクトリ
+DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), "ghost_mesh_cache")
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+# 生成関数の引数からキャッシュのキーを計算する
+# - 配列は dtype・形状・内容、それ以外の値は repr をハッシュに含める
+def content_key(name, args):
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(MAGIC + name.encode())
+    def feed(value):
+        if isinstance(value, np.ndarray):
+            digest.update(f"a{value.dtype.str}{value.shape}".encode())
+            digest.update(np.ascontiguousarray(value).data)
+        elif isinstance(value, dict):
+            digest.update(b"d")
+            for key in sorted(value):
+                digest.update(repr(key).encode())
+                feed(value[key])
+        elif isinstance(value, (tuple, list)):
+            digest.update(f"t{len(value)}".encode())
+            for item in value:
+                feed(item)
+        else:
+            digest.update(f"v{value!r}".encode())
+    for arg in args:
+        feed(arg)
+    return digest.hexdigest()
+
+# ALIGN の倍数に切り上げる
+def _aligned(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+# 生成結果（配列・None・数値・タプル/リスト・整数キーの辞書の入れ子）を構造と配列の一覧に分解する
+def _flatten(value, arrays):
+    if isinstance(value, np.ndarray):
+        arrays.append(value)
+        return {"a": len(arrays) - 1}
+    if isinstance(value, dict):
+        return {"d": [[key, _flatten(item, arrays)] for key, item in value.items()]}
+    if isinstance(value, (tuple, list)):
+        return [_flatten(item, arrays) for item in value]
+    return value
+
+# _flatten で分解した構造から生成結果を組み立てる（タプル/リストはタプルとして復元する）
+def _unflatten(tree, arrays):
+    if isinstance(tree, dict):
+        if "a" in tree:
+            return arrays[tree["a"]]
+        return {key: _unflatten(item, arrays) for key, item in tree["d"]}
+    if isinstance(tree, list):
+        return tuple(_unflatten(item, arrays) for item in tree)
+    return tree
+
+# ディスクキャッシュ
+# - ファイルの更新日時を最終使用日時として扱い、容量の上限を超えたら古いものから削除する（LRU）
+# - 複数のワーカースレッドから同時に呼ばれるため、統計と容量の管理はロックで保護する
+class DiskCache:
+
+    def __init__(self, directory, limit):
+        self.directory = directory
+        self.limit = limit
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._sizes = {}
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith(EXTENSION):
+                try:
+                    self._sizes[name] = os.path.getsize(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + EXTENSION)
+
+    # キーに対応する生成結果を読み込む（無い場合・読めない場合は None）
+    # - 配列は読み取り専用のメモリマップとして返す
+    def load(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                if f.read(4) != MAGIC:
+                    raise ValueError("unknown cache format")
+                header_size = int.from_bytes(f.read(4), "little")
+                header = json.loads(f.read(header_size))
+            base = _aligned(8 + header_size)
+            arrays = [np.memmap(path, dtype=np.dtype(dtype), mode="r", offset=base + offset, shape=tuple(shape))
+                      if np.prod(shape) else np.empty(shape, dtype=dtype)
+                      for dtype, shape, offset in header["arrays"]]
+            result = _unflatten(header["tree"], arrays)
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Ghost disk cache: discarding {path}: {e}")
+            with self._lock:
+                self.misses += 1
+                self.errors += 1
+            self._remove(key + EXTENSION)
+            return None
+        with self._lock:
+            self.hits += 1
+        return result
+
+    # 生成結果を保存し、容量の上限を超えた分を古いエントリから削除する
+    # - 一時ファイルに書き込んでから置き換えるため、読み込み中のエントリが壊れることはない
+    def store(self, key, value):
+        arrays = []
+        tree = _flatten(value, arrays)
+        entries = []
+        offset = 0
+        for array in arrays:
+            offset = _aligned(offset)
+            entries.append([array.dtype.str, list(array.shape), offset])
+            offset += array.nbytes
+        header = json.dumps({"tree": tree, "arrays": entries}).encode()
+        base = _aligned(8 + len(header))
+
+        name = key + EXTENSION
+        path = self._path(key)
+        temp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp, "wb") as f:
+                f.write(MAGIC + len(header).to_bytes(4, "little") + header)
+                for array, (_, _, start) in zip(arrays, entries):
+                    f.seek(base + start)
+                    f.write(np.ascontiguousarray(array).data)
+            size = os.path.getsize(temp)
+            os.replace(temp, path)
+        except OSError as e:
+            print(f"Ghost disk cache: failed to write {path}: {e}")
+            with self._lock:
+                self.errors += 1
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self.writes += 1
+            self._sizes[name] = size
+        self.evict(keep=name)
+
+    # 合計サイズが上限以下になるまで最終使用日時の古いエントリを削除する
+    def evict(self, keep=None):
+        with self._lock:
+            total = sum(self._sizes.values())
+            if total <= self.limit:
+                return
+            names = list(self._sizes)
+        def last_used(name):
+            try:
+                return os.path.getmtime(os.path.join(self.directory, name))
+            except OSError:
+                return 0.0
+        for name in sorted(names, key=last_used):
+            if total <= self.limit:
+                break
+            if name == keep:
+                continue
+            size = self._sizes.get(name, 0)
+            if self._remove(name):
+                total -= size
+                with self._lock:
+                    self.evictions += 1
+
+    # エントリのファイルを削除する（メモリマップ中で削除できない場合は False）
+    def _remove(self, name):
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+        with self._lock:
+            self._sizes.pop(name, None)
+        return True
+
+    # 全エントリを削除する
+    def clear(self):
+        for name in list(self._sizes):
+            self._remove(name)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "entries": len(self._sizes),
+                "bytes": sum(self._sizes.values()),
+                "limit": self.limit,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "errors": self.errors,
+            }
+
+# 保存先ディレクトリごとのディスクキャッシュを取得する（上限は最後に指定した値に更新する）
+def get_cache(directory, limit):
+    directory = os.path.abspath(directory or DEFAULT_DIRECTORY)
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = DiskCache(directory, limit)
+        cache.limit = limit
+    return cache
+
+# 作成済みのディスクキャッシュの統計
+def all_stats():
+    with _caches_lock:
+        caches = list(_caches.values())
+    return [cache.stats() for cache in caches]
+
+# 生成関数をディスクキャッシュ経由で呼び出す関数を返す（ワーカースレッドで実行される）
+# - 入力の内容が同じエントリがあれば生成を省略して読み込んだ結果を返す
+def cached(build, cache):
+    def run(*args):
+        key = content_key(build.__name__, args)
+        result = cache.load(key)
+        if result is None:
+            result = build(*args)
+            cache.store(key, result)
+        return result
+    return run
@@ -1,12 +1,32 @@
 import bpy
-import gpu
-import bmesh
+import time
+import itertools
+import numpy as np
 from bpy.app.handlers import persistent
-from gpu_extras.batch import batch_for_shader
-from mathutils import Matrix, Vector
+from mathutils import Matrix
 from bpy.props import FloatVectorProperty
 from . import gm_prop
+from . import gm_cache
+from . import gm_core
+from . import gm_disk
+from . import gm_jobs
+from . import gm_schedule
+from . import gm_shader
+from . import gm_stats
 
+# 形状の生成・カリングの計算は gm_core に置き、ここではメッシュからの読み込みとバッチの作成・描画を行う
+# - gpu / gpu_extras はアドオン有効化時ではなく、初回描画時に各関数内で読み込む
+
+# 静止した非表示オブジェクトとみなすまでの、最後に移動・変形してからの経過時間（秒）
+MERGE_SETTLE = 1.0
+
+# セル単位の結合の対象とするオブジェクトの三角形数の上限
+# - これより大きいオブジェクトは結合せず、詳細度を切り替えながら個別に描画する
+MERGE_MAX_TRIANGLES = 20000
+
+# キャッシュの破棄対象から除く、他のリージョンで描画中とみなす最後の描画からの経過時間（秒）
+# - 閉じられた・再描画されなくなったリージョンの描画対象はこの時間を過ぎると保持しない
+ON_SCREEN_KEEP = 1.0
 
 # オブジェクトの描画状態を保持するクラス
 # - 各オブジェクトごとに描画キャッシュ、バッチ、ワールド行列などを保持する
@@ -14,130 +34,548 @@ class _draw_objectsData:
     def __init__(self):
         self.is_cache     = False
         self.is_display   = False
+        self.matrix_world = Matrix.Identity(4)
+        self.shared_key   = None
+        self.chunks       = {}
+        self.bounds       = None
+        self.lod          = 0
+        self.pointer      = 0
+        self.rebuilds     = 0
+        self.refreshes    = 0
+        self.topology     = None
+        self.moved_at     = 0.0
+        self.job          = None
+    
+    # 描画する (面バッチ, 辺バッチ) の一覧を返す
+    # - 編集モードはチャンク単位、オブジェクトモードは共有バッチの現在の LOD を参照する
+    def batches(self):
+        if self.chunks:
+            return [(chunk.batch_face, chunk.batch_edge) for chunk in self.chunks.values()]
+        shared = _shared_batches.get(self.shared_key)
+        if shared is not None:
+            return [shared.level(self.lod)]
+        return []
+
+# 編集モードのゴースト形状を面インデックスの範囲で分割したチャンク
+# - hash が変わらないチャンクは再生成時も GPU バッチを再利用する
+# - トポロジーが変わらない変形では verts（元の頂点番号）から座標のみを更新し、
+#   スロット番号の頂点バッファとインデックスバッファは再利用する
+class _ghostChunk:
+    def __init__(self, chunk_hash):
+        self.hash         = chunk_hash
         self.batch_edge   = None
         self.batch_face   = None
-        self.matrix_world = Matrix.Identity(4)
+        self.verts        = None
+        self.slot_vbo     = None
+        self.ibo_face     = None
+        self.ibo_edge     = None
+        self.tri_count    = 0
+        self.edge_count   = 0
+        self.nbytes       = 0
+
+# メッシュデータ単位で共有される描画バッチを保持するクラス
+# - リンク複製（Alt+D）など同一ジオメトリを参照するオブジェクト間で共有し、
+#   users が 0 になった時点で解放する
+class _shared_batchData:
+    def __init__(self):
+        self.is_cache     = False
+        self.batch_edge   = None
+        self.batch_face   = None
+        self.has_slots    = False
+        self.lods         = []
+        self.buffers      = []
+        self.arrays       = None
+        self.generation   = 0
+        self.topology     = None
+        self.nbytes       = 0
+        self.users        = 0
+        self.job          = None
+    
+    # 指定した詳細度の (面バッチ, 辺バッチ) を返す（0 が元の形状、範囲外は最も粗い段階）
+    def level(self, index):
+        if not self.lods:
+            return self.batch_face, self.batch_edge
+        _, _, batch_face, batch_edge = self.lods[min(index, len(self.lods) - 1)]
+        return batch_face, batch_edge
+    
+    # 許容三角形数に収まる最も詳細な段階の番号を返す（収まらない場合は最も粗い段階）
+    def pick_level(self, allowed):
+        for index, (tri_count, _, _, _) in enumerate(self.lods):
+            if tri_count <= allowed:
+                return index
+        return max(len(self.lods) - 1, 0)
 
-_draw_objects = {}
-_shader_cache = None
+_shared_batches = {}
 
-# 組み込みシェーダーを取得・キャッシュする関数
-# - 初回呼び出しで組み込みシェーダーを取得し、以後はキャッシュを返す
-# - シェーダー初期化に失敗した場合は None を返す可能性がある
-def get_shader():
-    global _shader_cache
-    if _shader_cache is None:
-        try:
-            _shader_cache = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        except Exception:
-            try:
-                _shader_cache = gpu.shader.from_builtin('UNIFORM_COLOR')
-            except Exception as e:
-                print(f"Shader initialization failed: {e}")
-    return _shader_cache
+# マテリアルスロットごとの半透明描画除外フラグを配列で返す
+# - スロットが無い場合は None（除外なし）
+def _excluded_slot_mask(obj):
+    slots = obj.material_slots
+    if len(slots) == 0:
+        return None
+    mask = np.zeros(len(slots), dtype=bool)
+    for i, slot in enumerate(slots):
+        mat = slot.material
+        mask[i] = bool(mat and getattr(mat, "ghost_hide", True))
+    return mask
+
+# 半透明描画から除外するマテリアルスロットのビットマスク (下位 32 スロット, 上位 32 スロット) を返す
+def _slot_mask(obj):
+    return gm_core.slot_mask_bits(_excluded_slot_mask(obj))
+
+# 編集モードのゴーストのトポロジー（座標以外の生成に使う配列）
+_EDIT_TOPOLOGY_KEYS = ("edge_verts", "loop_edge", "loop_start", "loop_total", "hide", "mat_index", "tri_verts", "tri_poly")
+
+# 評価メッシュから編集モードのゴースト生成に必要な配列を foreach_get で一括取得する
+def _read_edit_arrays(mesh):
+    n_vert, n_edge = len(mesh.vertices), len(mesh.edges)
+    n_loop, n_poly = len(mesh.loops), len(mesh.polygons)
+    arrays = {
+        "co"         : np.empty(n_vert * 3, dtype=np.float32),
+        "edge_verts" : np.empty(n_edge * 2, dtype=np.int32),
+        "loop_edge"  : np.empty(n_loop, dtype=np.int32),
+        "loop_start" : np.empty(n_poly, dtype=np.int32),
+        "loop_total" : np.empty(n_poly, dtype=np.int32),
+        "hide"       : np.empty(n_poly, dtype=bool),
+        "mat_index"  : np.empty(n_poly, dtype=np.int32),
+    }
+    mesh.vertices.foreach_get("co", arrays["co"])
+    mesh.edges.foreach_get("vertices", arrays["edge_verts"])
+    mesh.loops.foreach_get("edge_index", arrays["loop_edge"])
+    mesh.polygons.foreach_get("loop_start", arrays["loop_start"])
+    mesh.polygons.foreach_get("loop_total", arrays["loop_total"])
+    mesh.polygons.foreach_get("hide", arrays["hide"])
+    mesh.polygons.foreach_get("material_index", arrays["mat_index"])
+    mesh.calc_loop_triangles()
+    n_tri = len(mesh.loop_triangles)
+    arrays["tri_verts"] = np.empty(n_tri * 3, dtype=np.int32)
+    arrays["tri_poly"] = np.empty(n_tri, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", arrays["tri_verts"])
+    mesh.loop_triangles.foreach_get("polygon_index", arrays["tri_poly"])
+    arrays["co"].shape = (n_vert, 3)
+    arrays["edge_verts"].shape = (n_edge, 2)
+    arrays["tri_verts"].shape = (n_tri, 3)
+    return arrays
+
+# ワーカースレッドで実行する生成関数を返す
+# - ディスクキャッシュが有効な場合は入力配列の内容が同じ生成結果をディスクから読み込む
+# - オブジェクトモードのゴーストのみに使う（編集モードは座標もキーに含まれ、編集のたびに
+#   大きなエントリを書き込むだけで再利用されないため）
+def _builder(scn, build):
+    if not getattr(scn, "ghost_disk_cache", False):
+        return build
+    limit = getattr(scn, "ghost_disk_cache_limit", 2048) * 1024 * 1024
+    directory = bpy.path.abspath(getattr(scn, "ghost_disk_cache_dir", ""))
+    try:
+        cache = gm_disk.get_cache(directory, limit)
+    except OSError as e:
+        print(f"Ghost disk cache unavailable: {e}")
+        return build
+    return gm_disk.cached(build, cache)
 
 # 編集モード向けメッシュ解析とバッチ生成
-# - 編集モード中の非表示（hidden）フェースを BMesh で解析し、
-#   面バッチと辺バッチを作成して cache に格納する
-# - 評価メッシュと BMesh は finally で確実に解放される
+# - メインスレッドでは評価メッシュを配列として読み込むだけに留め、
+#   非表示面の抽出と三角形分割・辺の重複除去はワーカースレッドで行う
+# - 生成結果は次回以降の描画時に _apply_edit_chunks で GPU バッチ化される
+# - 評価メッシュは finally で確実に解放される
 def update_mesh_cache(obj, scn, cache):
     
-    cache.batch_face = cache.batch_edge = None
+    _release_shared(cache)
     
     # モディファイア適用後のメッシュを取得
-    depsgraph = bpy.context.evaluated_depsgraph_get()
-    evaluated = obj.evaluated_get(depsgraph)
+    # - 生成元が CAGE の場合は元のオブジェクトから、モディファイアを評価せずに編集中のメッシュを取得する
+    # - 編集モードでは PROXY は EVALUATED と同じ扱いにする（非表示面の判定に元の面が必要なため）
+    source = _ghost_source(obj, scn)
+    if source == 'CAGE':
+        evaluated = obj
+    else:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        evaluated = obj.evaluated_get(depsgraph)
     eval_mesh = None
-    bm = None
     try:
         eval_mesh = evaluated.to_mesh()
-        
-        # BMeshによるメッシュ解析開始
-        bm = bmesh.new()
-        bm.from_mesh(eval_mesh)
-        
-        # 非表示マテリアルの面情報を取得する
-        faces = [face for face in bm.faces if face.hide]
-        shader = get_shader()
-        
-        # 描画バッチの作成
-        verts, indices = [], []
-        edge_verts, edge_exists = [], set()
-        for face in faces:
-            # 特定のマテリアルの半透明描画を除外する判定
-            if len(obj.material_slots) > 0:
-                mat = obj.material_slots[face.material_index].material
-                if mat and getattr(mat, "ghost_hide", True): continue
-                
-            if getattr(scn, "edit_ghost_display_face", True):
-                start_idx = len(verts)
-                for loop in face.loops:
-                    verts.append(loop.vert.co.to_tuple())
-                for i in range(1, len(face.verts) - 1):
-                    indices.append((start_idx, start_idx + i, start_idx + i + 1))
-                if verts:
-                    cache.batch_face = batch_for_shader(shader, 'TRIS', {"pos": verts}, indices=indices)
-        
-            if getattr(scn, "edit_ghost_display_edge", True):
-                for edge in face.edges:
-                    if edge.index not in edge_exists:
-                        edge_exists.add(edge.index)
-                        edge_verts.append(edge.verts[0].co.to_tuple())
-                        edge_verts.append(edge.verts[1].co.to_tuple())
-                if edge_verts:
-                    cache.batch_edge = batch_for_shader(shader, 'LINES', {"pos": edge_verts})
-        
-        cache.is_cache = True
+        arrays = _read_edit_arrays(eval_mesh)
     finally:
-        if bm is not None:
-            bm.free()
         if eval_mesh is not None:
             evaluated.to_mesh_clear()
+    
+    # 非表示面の抽出
+    # - 特定マテリアルの半透明描画の除外は描画時にシェーダーのマスクで行う
+    #   （シェーダーが使えない環境のみ生成時に除外する）
+    excluded = None if gm_shader.get_slot_shader() is not None else _excluded_slot_mask(obj)
+    show_face = getattr(scn, "edit_ghost_display_face", True)
+    show_edge = getattr(scn, "edit_ghost_display_edge", True)
+    
+    # 頂点の移動のみでトポロジー・非表示面が変わっていない場合は座標のみを更新する
+    topology = (gm_core.chunk_hash(*(arrays[key] for key in _EDIT_TOPOLOGY_KEYS)), len(arrays["co"]),
+                None if excluded is None else excluded.tobytes(), show_face, show_edge, source == 'CAGE')
+    cache.is_cache = True
+    if cache.topology == topology and cache.job is None and cache.chunks:
+        _refresh_edit_positions(cache, arrays["co"])
+        cache.refreshes += 1
+        _draw_objects.record(True)
+        return
+    cache.topology = topology
+    gm_jobs.start_job(cache, scn, gm_core.build_edit_chunks, (
+        arrays, excluded, show_face, show_edge), _apply_edit_chunks)
+    cache.rebuilds += 1
+    _draw_objects.record(False)
+
+# 生成したチャンクを描画バッチに変換する（メインスレッドで実行）
+# - 非表示面・頂点座標が変わっていないチャンクは以前のバッチを再利用する
+def _apply_edit_chunks(cache, chunks):
+    slot_shader = gm_shader.get_slot_shader()
+    previous, applied = cache.chunks, {}
+    for chunk_id, (chunk_hash, positions, slots, tris, edges, verts) in chunks.items():
+        chunk = previous.get(chunk_id)
+        if chunk is None or chunk.hash != chunk_hash:
+            chunk = _ghostChunk(chunk_hash)
+            # 面/辺のバッチで頂点バッファを共有する
+            chunk.slot_vbo = _slot_vertbuf(slots) if slot_shader else None
+            chunk.ibo_face = _index_buffer('TRIS', tris)
+            chunk.ibo_edge = _index_buffer('LINES', edges)
+            chunk.batch_face, chunk.batch_edge = _position_batches(
+                positions, chunk.slot_vbo, chunk.ibo_face, chunk.ibo_edge)
+            chunk.tri_count = len(tris) if tris is not None else 0
+            chunk.edge_count = len(edges) if edges is not None else 0
+            chunk.nbytes = sum(array.nbytes for array in (positions, slots, tris, edges) if array is not None)
+        # 元の頂点番号はハッシュ値に含まれない（前の頂点の削除でずれる）ため、再利用時も更新する
+        chunk.verts = verts
+        applied[chunk_id] = chunk
+    _set_chunks(cache, applied)
+
+# 描画キャッシュのチャンクを置き換え、レジストリの保持バイト数を更新する
+def _set_chunks(cache, chunks):
+    _draw_objects.add_bytes(sum(chunk.nbytes for chunk in chunks.values()) -
+                            sum(chunk.nbytes for chunk in cache.chunks.values()))
+    cache.chunks = chunks
+
+# 変形後の頂点座標で、座標が変わったチャンクの頂点座標バッファのみを作り直す
+# - 座標のハッシュ値を更新し、以降の再生成でも座標が同じチャンクのバッチを再利用できるようにする
+def _refresh_edit_positions(cache, co):
+    for chunk in cache.chunks.values():
+        positions = co[chunk.verts]
+        position_hash = gm_core.chunk_hash(positions)
+        if position_hash == chunk.hash[0]:
+            continue
+        chunk.hash = (position_hash, chunk.hash[1])
+        chunk.batch_face, chunk.batch_edge = _position_batches(
+            positions, chunk.slot_vbo, chunk.ibo_face, chunk.ibo_edge)
+
+# マテリアルスロットごとの表示色を (MASK_SLOTS, 4) の配列で返す
+# - マテリアルのビューポート表示色（diffuse_color）を使用し、未設定のスロットは既定の灰色とする
+# - スロット数を超える material_index は最後のスロットの色を使用する
+def _slot_colors(obj):
+    colors = np.full((gm_core.MASK_SLOTS, 4), 0.8, dtype=np.float32)
+    slots = obj.material_slots
+    for i, slot in enumerate(slots[:gm_core.MASK_SLOTS]):
+        mat = slot.material
+        if mat is not None:
+            colors[i] = mat.diffuse_color
+    if 0 < len(slots) < gm_core.MASK_SLOTS:
+        colors[len(slots):] = colors[len(slots) - 1]
+    return colors
+
+# 評価メッシュの頂点座標・三角形・辺を事前確保した配列へ foreach_get で直接読み込む
+# - Python の Vector/タプルを生成せず、float32/int32 のバッファをそのまま返す
+# - with_slots を指定した場合は三角形ごとの material_index も読み込む
+# - with_features を指定した場合は特徴辺の抽出に使う面法線・面ごとのループ数・ループの辺番号も読み込む
+def _read_object_arrays(mesh, with_faces, with_edges, with_slots=False, with_features=False):
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co.shape = (-1, 3)
+    
+    tris = edges = tri_slots = features = None
+    if with_faces:
+        mesh.calc_loop_triangles() # 三角形化データを内部計算
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", tris)
+        tris.shape = (-1, 3)
+        if with_slots:
+            tri_slots = np.empty(len(mesh.loop_triangles), dtype=np.int32)
+            mesh.loop_triangles.foreach_get("material_index", tri_slots)
+    if with_edges:
+        edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edges)
+        edges.shape = (-1, 2)
+        if with_features:
+            normals = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+            mesh.polygons.foreach_get("normal", normals)
+            normals.shape = (-1, 3)
+            loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+            mesh.polygons.foreach_get("loop_total", loop_total)
+            loop_edge = np.empty(len(mesh.loops), dtype=np.int32)
+            mesh.loops.foreach_get("edge_index", loop_edge)
+            features = (normals, loop_total, loop_edge)
+    return co, tris, edges, tri_slots, features
+
+# 頂点座標配列から "pos" 属性のみの GPUVertBuf を作成する
+# - 変形時に座標のみを作り直せるよう、スロット番号は別の頂点バッファに持たせる
+def _ghost_vertbuf(positions):
+    import gpu
+    fmt = gpu.types.GPUVertFormat()
+    fmt.attr_add(id="pos", comp_type='F32', len=3, fetch_mode='FLOAT')
+    vbo = gpu.types.GPUVertBuf(fmt, len(positions))
+    vbo.attr_fill(id="pos", data=positions)
+    return vbo
+
+# スロット番号配列から "slot" 属性の GPUVertBuf を作成する
+def _slot_vertbuf(slots):
+    import gpu
+    fmt = gpu.types.GPUVertFormat()
+    fmt.attr_add(id="slot", comp_type='F32', len=1, fetch_mode='FLOAT')
+    vbo = gpu.types.GPUVertBuf(fmt, len(slots))
+    vbo.attr_fill(id="slot", data=slots)
+    return vbo
+
+# インデックス配列から GPUIndexBuf を作成する（None の場合は None）
+def _index_buffer(prim_type, indices):
+    if indices is None:
+        return None
+    import gpu
+    return gpu.types.GPUIndexBuf(type=prim_type, seq=indices)
+
+# 頂点バッファ（座標 + スロット番号）とインデックスバッファから GPUBatch を作成する
+def _indexed_batch(prim_type, vbos, ibo):
+    import gpu
+    batch = gpu.types.GPUBatch(type=prim_type, buf=vbos[0], elem=ibo)
+    for vbo in vbos[1:]:
+        batch.vertbuf_add(vbo)
+    return batch
+
+# 頂点座標から座標バッファを作成し、既存のスロット番号バッファ・インデックスバッファと組み合わせて
+# (面バッチ, 辺バッチ) を返す
+def _position_batches(positions, slot_vbo, ibo_face, ibo_edge):
+    if not len(positions):
+        return None, None
+    vbos = (_ghost_vertbuf(positions),) if slot_vbo is None else (_ghost_vertbuf(positions), slot_vbo)
+    batch_face = _indexed_batch('TRIS', vbos, ibo_face) if ibo_face is not None else None
+    batch_edge = _indexed_batch('LINES', vbos, ibo_edge) if ibo_edge is not None else None
+    return batch_face, batch_edge
+
+# モディファイアスタックの設定値からシグネチャを作成する
+# - 同じメッシュデータでもモディファイア設定が異なるオブジェクトはバッチを共有しない
+# - ID プロパティを持てるのはジオメトリノードのみのため、RNA プロパティのみを比較する
+# - 他の ID（ブーリアンの演算対象・配列のオフセット・フック等）を参照するモディファイアや
+#   ジオメトリノードは、参照先との相対位置によって形状が変わるため None を返す（共有しない）
+def _modifier_signature(obj):
+    signature = []
+    for mod in obj.modifiers:
+        if not mod.show_viewport:
+            continue
+        if mod.type == 'NODES':
+            return None
+        values = []
+        for prop in mod.bl_rna.properties:
+            if prop.identifier in ("rna_type", "name", "show_expanded", "is_active"):
+                continue
+            value = getattr(mod, prop.identifier, None)
+            if prop.type == 'POINTER':
+                if isinstance(value, bpy.types.ID):
+                    return None
+                value = getattr(value, "name_full", None)
+            elif prop.type == 'COLLECTION':
+                continue
+            elif prop.type == 'ENUM' and prop.is_enum_flag:
+                value = tuple(sorted(value))
+            elif getattr(prop, "is_array", False):
+                value = tuple(value)
+            values.append(value)
+        signature.append((mod.type, tuple(values)))
+    return tuple(signature)
 
+# オブジェクトのゴーストの生成元（EVALUATED / CAGE / PROXY）を返す
+# - オブジェクトの設定が SCENE の場合はシーンの設定に従う
+def _ghost_source(obj, scn):
+    source = getattr(obj, "ghost_source", 'SCENE')
+    if source == 'SCENE':
+        source = getattr(scn, "ghost_source", 'EVALUATED')
+    return source
+
+# 共有バッチのキー（メッシュデータ名 + モディファイアシグネチャ）を返す
+# - CAGE はモディファイアを評価しないため、メッシュデータ名のみで共有する
+# - PROXY は三角形数の上限もキーに含め、同じメッシュの EVALUATED のバッチとは分ける
+# - 他のオブジェクトに依存するモディファイアを持つ場合はオブジェクトごとのキーとする
+def _geometry_key(obj, scn):
+    source = _ghost_source(obj, scn)
+    if source == 'CAGE':
+        return (obj.data.name_full, source)
+    signature = _modifier_signature(obj)
+    if signature is None:
+        signature = ("OBJECT", obj.session_uid)
+    if source == 'PROXY':
+        return (obj.data.name_full, signature, source, scn.ghost_proxy_triangles)
+    return (obj.data.name_full, signature)
+
+# 共有バッチの参照を取得し、参照カウントを更新する
+def _acquire_shared(cache, key):
+    if cache.shared_key != key:
+        _release_shared(cache)
+        shared = _shared_batches.get(key)
+        if shared is None:
+            shared = _shared_batches[key] = _shared_batchData()
+        shared.users += 1
+        cache.shared_key = key
+    return _shared_batches[key]
+
+# 共有バッチの参照を解放し、利用者がいなくなったバッチを破棄する
+def _release_shared(cache):
+    key = cache.shared_key
+    if key is None:
+        return
+    cache.shared_key = None
+    shared = _shared_batches.get(key)
+    if shared is not None:
+        shared.users -= 1
+        if shared.users <= 0:
+            _draw_objects.add_bytes(-shared.nbytes)
+            del _shared_batches[key]
+
+# オブジェクトの描画キャッシュが保持する GPU バッファのバイト数（推定）を返す
+# - 共有バッチは利用オブジェクト数で按分する
+def _cache_bytes(cache):
+    total = sum(chunk.nbytes for chunk in cache.chunks.values())
+    shared = _shared_batches.get(cache.shared_key)
+    if shared is not None:
+        total += shared.nbytes / max(shared.users, 1)
+    return total
+
+# レジストリから破棄される描画キャッシュのチャンクと共有バッチの参照を手放す
+def _release_cache(cache):
+    _release_shared(cache)
+    _set_chunks(cache, {})
+    cache.job = None
+    cache.is_cache = False
+
+# オブジェクトの session_uid をキーとする描画キャッシュのレジストリ
+_draw_objects = gm_cache.CacheRegistry(_draw_objectsData, _release_cache, _cache_bytes)
+
+# オブジェクトの再生成に加えて、共有バッチも再生成対象にする
+def _mark_geometry_dirty(cache):
+    cache.is_cache = False
+    cache.bounds = None
+    cache.moved_at = time.monotonic()
+    shared = _shared_batches.get(cache.shared_key)
+    if shared is not None:
+        shared.is_cache = False
 
 # オブジェクトモード向けバッチ生成
-# - 非表示オブジェクトの評価メッシュを取得し、面/辺のバッチを作成する
-# - 評価メッシュは finally で解放される
+# - 同一ジオメトリを参照するオブジェクト間で共有バッチを利用し、
+#   未生成の場合のみ評価メッシュからバッチの生成を開始する
+# - 描画時はオブジェクトごとの matrix_world のみを使用する
 def update_object_cache(obj, scn, cache):
     
-    cache.batch_face = None
-    cache.batch_edge = None
+    _set_chunks(cache, {})
     
     # 非表示オブジェクトを描画しない場合は処理行わない
     if getattr(obj, "ghost_hide", False):
+        _release_shared(cache)
+        cache.is_cache = True
         return
     
-    # モディファイア適用後のメッシュを取得
-    depsgraph = bpy.context.evaluated_depsgraph_get()
-    evaluated = obj.evaluated_get(depsgraph)
-    mesh = None
-    try:
-        mesh = evaluated.to_mesh()
-        mesh.calc_loop_triangles() # 三角形化データを内部計算
-        
-        # 頂点とインデックスを Vector/Tuple のリストとして一括取得
-        verts = [v.co for v in mesh.vertices]
-        faces = [t.vertices for t in mesh.loop_triangles]
-        
-        shader = get_shader()
-        if getattr(scn, "object_ghost_display_face", True):
-            cache.batch_face = batch_for_shader(shader, 'TRIS', {"pos": verts}, indices=faces)
-        
-        if getattr(scn, "object_ghost_display_edge", True):
-            edges = [e.vertices for e in mesh.edges]
-            cache.batch_edge = batch_for_shader(shader, 'LINES', {"pos": verts}, indices=edges)
-        
-        cache.is_cache = True
-    finally:
-        if mesh is not None:
-            evaluated.to_mesh_clear()
+    # 生成済みの共有バッチの再利用・座標のみの更新はヒット、形状の再生成はミスとして記録する
+    shared = _acquire_shared(cache, _geometry_key(obj, scn))
+    if not shared.is_cache:
+        if _request_object_batches(obj, scn, shared):
+            cache.rebuilds += 1
+            _draw_objects.record(False)
+        else:
+            cache.refreshes += 1
+            _draw_objects.record(True)
+    else:
+        _draw_objects.record(True)
+    cache.is_cache = True
+
+# 共有バッチの生成開始
+# - 非表示オブジェクトの評価メッシュを配列として読み込み、ワーカースレッドへ渡す
+# - 生成元が CAGE の場合は評価メッシュを作らず、元のメッシュデータをそのまま読み込む
+# - 生成元が PROXY の場合は三角形数が ghost_proxy_triangles 以下の簡略化形状のみを作成する
+# - アーマチュア・シェイプキー等の変形でトポロジーが変わっていない場合は座標のみを更新する
+#   （特徴辺の選択は最後に生成した時の形状のものを使い続ける）
+# - 評価メッシュは finally で解放される
+# - 形状を生成し直した場合は True、座標のみを更新した場合は False を返す
+def _request_object_batches(obj, scn, shared):
+    
+    show_face = getattr(scn, "object_ghost_display_face", True)
+    show_edge = getattr(scn, "object_ghost_display_edge", True)
+    with_slots = show_face and getattr(scn, "ghost_color_mode", 'SINGLE') == 'MATERIAL'
+    feature_angle = None
+    if show_edge and getattr(scn, "object_ghost_edge_mode", 'ALL') == 'FEATURE':
+        feature_angle = scn.object_ghost_feature_angle
+    
+    source = _ghost_source(obj, scn)
+    if source == 'CAGE':
+        arrays = _read_object_arrays(obj.data, show_face, show_edge, with_slots, feature_angle is not None)
+    else:
+        # モディファイア適用後のメッシュを取得
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = None
+        try:
+            mesh = evaluated.to_mesh()
+            arrays = _read_object_arrays(mesh, show_face, show_edge, with_slots, feature_angle is not None)
+        finally:
+            if mesh is not None:
+                evaluated.to_mesh_clear()
+    
+    lod_budget = scn.ghost_lod_budget if getattr(scn, "ghost_lod", False) else 0
+    max_triangles = scn.ghost_proxy_triangles if source == 'PROXY' else 0
+    co, tris, edges, tri_slots, features = arrays
+    topology = (gm_core.chunk_hash(tris, edges, tri_slots, *(features[1:] if features else ())),
+                len(co), feature_angle, lod_budget, max_triangles)
+    shared.is_cache = True
+    if shared.topology == topology and shared.job is None and shared.lods:
+        _refresh_object_positions(shared, co)
+        return False
+    shared.topology = topology
+    gm_jobs.start_job(shared, scn, _builder(scn, gm_core.build_object_geometry), arrays + (feature_angle, lod_budget, max_triangles), _apply_object_geometry)
+    return True
+
+# 生成した配列を描画バッチに変換する（メインスレッドで実行）
+# - 段階ごとに面/辺のバッチで頂点バッファを共有する
+# - 座標の更新用に段階ごとの座標の参照元・スロット番号バッファ・インデックスバッファを保持する
+def _apply_object_geometry(shared, levels):
+    shared.lods = []
+    shared.buffers = []
+    nbytes = sum(array.nbytes for level in levels for array in level[:4] if array is not None)
+    _draw_objects.add_bytes(nbytes - shared.nbytes)
+    shared.nbytes = nbytes
+    for co, slots, tris, edges, source in levels:
+        slot_vbo = _slot_vertbuf(slots) if slots is not None and len(co) else None
+        ibo_face = _index_buffer('TRIS', tris)
+        ibo_edge = _index_buffer('LINES', edges)
+        batch_face, batch_edge = _position_batches(co, slot_vbo, ibo_face, ibo_edge)
+        shared.lods.append((len(tris) if tris is not None else 0,
+                            len(edges) if edges is not None else 0, batch_face, batch_edge))
+        shared.buffers.append((source, slot_vbo, ibo_face, ibo_edge))
+    shared.has_slots = levels[0][1] is not None
+    _, _, shared.batch_face, shared.batch_edge = shared.lods[0]
+    # 元の形状の配列はセル単位の結合に使う
+    shared.arrays = levels[0][:4]
+    shared.generation += 1
+
+# 変形後の頂点座標で各段階の頂点座標バッファのみを作り直す
+def _refresh_object_positions(shared, co):
+    lods = []
+    for (tri_count, edge_count, _, _), (source, slot_vbo, ibo_face, ibo_edge) in zip(shared.lods, shared.buffers):
+        positions = gm_core.level_positions(co, source)
+        if not lods:
+            shared.arrays = (positions,) + shared.arrays[1:]
+        lods.append((tri_count, edge_count) + _position_batches(positions, slot_vbo, ibo_face, ibo_edge))
+    shared.lods = lods
+    _, _, shared.batch_face, shared.batch_edge = shared.lods[0]
+    shared.generation += 1
 
 # GPU バッチを使用して半透明面およびエッジを描画する
 # - シェーダーと MVP 行列を設定し、必要に応じて面/辺を描画する
+# - slot_mask を指定した場合はスロットマスク用シェーダーで除外マテリアルを描画しない
+# - slot_colors を指定した場合は面をマテリアルスロットごとの色で描画する（辺は color_edge のまま）
 # - GPU ステート（深度テスト・ブレンド・カリング）を設定し、描画後に復元する
-def draw_ghost_geometry(cache, color_face, color_edge, line_width):
+def draw_ghost_geometry(cache, color_face, color_edge, line_width, slot_mask=None, slot_colors=None):
+    import gpu
     
-    if not cache.batch_face and not cache.batch_edge:
+    batches = [pair for pair in cache.batches() if pair[0] or pair[1]]
+    if not batches:
         return
 
     # MVP行列の合成
@@ -145,27 +583,335 @@ def draw_ghost_geometry(cache, color_face, color_edge, line_width):
     proj_matrix = gpu.matrix.get_projection_matrix()
     mvp_matrix = proj_matrix @ view_matrix @ cache.matrix_world
     
-    shader = get_shader()
-    shader.bind()
+    shader = gm_shader.get_slot_shader() if slot_mask is not None or slot_colors is not None else None
+    use_slots = shader is not None
+    if use_slots:
+        shader.bind()
+        shader.uniform_int("mask_lo", slot_mask[0] if slot_mask else 0)
+        shader.uniform_int("mask_hi", slot_mask[1] if slot_mask else 0)
+        shader.uniform_block("slot_colors", gm_shader.color_ubo(slot_colors))
+    else:
+        shader = gm_shader.get_shader()
+        shader.bind()
     shader.uniform_float("ModelViewProjectionMatrix", mvp_matrix)
     
     gpu.state.depth_test_set('LESS')
     gpu.state.blend_set('ALPHA')
     gpu.state.face_culling_set('BACK')
     
-    if cache.batch_face:
-        shader.uniform_float("color", color_face)
-        cache.batch_face.draw(shader)
+    if use_slots:
+        shader.uniform_int("use_slot_color", int(slot_colors is not None))
+    shader.uniform_float("color", color_face)
+    for batch_face, _ in batches:
+        if batch_face:
+            batch_face.draw(shader)
     
-    if cache.batch_edge:
-        gpu.state.line_width_set(line_width)
-        shader.uniform_float("color", color_edge)
-        cache.batch_edge.draw(shader)
+    gpu.state.line_width_set(line_width)
+    if use_slots:
+        shader.uniform_int("use_slot_color", 0)
+    shader.uniform_float("color", color_edge)
+    for _, batch_edge in batches:
+        if batch_edge:
+            batch_edge.draw(shader)
     
     gpu.state.face_culling_set('NONE')
     gpu.state.blend_set('NONE')
     gpu.state.depth_test_set('NONE')
 
+# 共有バッチごとにまとめた非表示オブジェクトを一括描画する
+# - groups は {キー: ((面バッチ, 辺バッチ), [ワールド行列], スロットごとの色 or None)}
+# - GPU ステートの設定とシェーダーのバインドは単色・マテリアル色の種類ごとに一度だけ行う
+# - インスタンス描画用シェーダーが使える場合はグループを 1 回のドローコールで描画し、
+#   使えない場合はオブジェクトごとに MVP 行列のみを切り替えて描画する
+def draw_ghost_groups(groups, color_face, color_edge, line_width):
+    import gpu
+    
+    if not groups:
+        return
+    
+    view_matrix = gpu.matrix.get_model_view_matrix()
+    proj_matrix = gpu.matrix.get_projection_matrix()
+    view_proj = proj_matrix @ view_matrix
+    
+    gpu.state.depth_test_set('LESS')
+    gpu.state.blend_set('ALPHA')
+    gpu.state.face_culling_set('BACK')
+    gpu.state.line_width_set(line_width)
+    
+    for slot_color in (False, True):
+        items = [(key, group) for key, group in groups.items() if (group[2] is not None) == slot_color]
+        if not items:
+            continue
+        
+        # 複数オブジェクトのグループのみインスタンス描画し、行列は全グループで共有の UBO に詰める
+        # - 1 オブジェクトのグループは UBO を使わず、MVP 行列のみを切り替えて描画する
+        shader = gm_shader.get_instance_shader(slot_color)
+        if shader is not None:
+            instanced = [(key, group) for key, group in items if len(group[1]) > 1]
+            items = [(key, group) for key, group in items if len(group[1]) == 1]
+            if instanced:
+                ranges = gm_shader.instance_ranges([(key, group[1]) for key, group in instanced])
+                shader.bind()
+                shader.uniform_float("ViewProjectionMatrix", view_proj)
+                for (key, ((batch_face, batch_edge), _, colors)), parts in zip(instanced, ranges):
+                    if slot_color:
+                        shader.uniform_block("slot_colors", gm_shader.color_ubo(colors))
+                    for ubo, offset, count in parts:
+                        shader.uniform_block("instances", ubo)
+                        shader.uniform_int("instance_offset", offset)
+                        if batch_face:
+                            if slot_color:
+                                shader.uniform_int("use_slot_color", 1)
+                            shader.uniform_float("color", color_face)
+                            batch_face.draw_instanced(shader, instance_start=0, instance_count=count)
+                        if batch_edge:
+                            if slot_color:
+                                shader.uniform_int("use_slot_color", 0)
+                            shader.uniform_float("color", color_edge)
+                            batch_edge.draw_instanced(shader, instance_start=0, instance_count=count)
+            if not items:
+                continue
+        
+        # インスタンス描画が使えない場合・1 オブジェクトのグループはオブジェクトごとに描画する
+        shader = (gm_shader.get_slot_shader() if slot_color else None)
+        if shader is not None:
+            shader.bind()
+            shader.uniform_int("mask_lo", 0)
+            shader.uniform_int("mask_hi", 0)
+        else:
+            slot_color = False
+            shader = gm_shader.get_shader()
+            shader.bind()
+        for key, ((batch_face, batch_edge), matrices, colors) in items:
+            if slot_color:
+                shader.uniform_block("slot_colors", gm_shader.color_ubo(colors))
+            for matrix in matrices:
+                shader.uniform_float("ModelViewProjectionMatrix", view_proj @ matrix)
+                if batch_face:
+                    if slot_color:
+                        shader.uniform_int("use_slot_color", 1)
+                    shader.uniform_float("color", color_face)
+                    batch_face.draw(shader)
+                if batch_edge:
+                    if slot_color:
+                        shader.uniform_int("use_slot_color", 0)
+                    shader.uniform_float("color", color_edge)
+                    batch_edge.draw(shader)
+    
+    gpu.state.face_culling_set('NONE')
+    gpu.state.blend_set('NONE')
+    gpu.state.depth_test_set('NONE')
+
+# 再生成が必要なキャッシュの処理一覧を優先度順に作成する
+# - アクティブ > 選択中 > 表示範囲内 の順に、同順位では画面上の大きさが大きい順
+# - 画面上の大きさは AABB の対角線長 / 視点からの距離で近似する
+def _rebuild_tasks(drawn, scn, active, view_matrix):
+    dirty = [(obj, cache, visible) for obj, cache, visible in drawn if not cache.is_cache]
+    if not dirty:
+        return []
+    
+    eye = np.array(view_matrix.inverted().translation)
+    bounds = np.array([cache.bounds for _, cache, _ in dirty])
+    diagonal = np.linalg.norm(bounds[:, 3:] - bounds[:, :3], axis=1)
+    distance = np.linalg.norm((bounds[:, 3:] + bounds[:, :3]) * 0.5 - eye, axis=1)
+    sizes = diagonal / np.maximum(distance, 1e-6)
+    
+    ranked = []
+    for (obj, cache, visible), size in zip(dirty, sizes):
+        rank = 0 if obj == active else 1 if obj.select_get() else 2 if visible else 3
+        if obj.mode == 'EDIT' and not obj.hide_get():
+            task = (update_mesh_cache, obj, scn, cache)
+        else:
+            task = (update_object_cache, obj, scn, cache)
+        ranked.append((rank, -size, len(ranked), task))
+    ranked.sort()
+    return [task for *_, task in ranked]
+
+# ゴースト描画対象のオブジェクト 1 つ分のスナップショット
+class _ghostTarget:
+    __slots__ = ("obj", "uid", "cache", "is_edit", "is_selected", "slot_mask", "colors", "colors_key")
+    
+    def __init__(self, obj, cache, is_edit, is_selected, slot_mask, colors):
+        self.obj         = obj
+        self.uid         = obj.session_uid
+        self.cache       = cache
+        self.is_edit     = is_edit
+        self.is_selected = is_selected
+        self.slot_mask   = slot_mask
+        self.colors      = colors
+        self.colors_key  = colors.tobytes() if colors is not None else None
+
+# 再描画ごとに全 View3D リージョンで共有するシーンのスナップショット
+# - ゴースト描画対象のオブジェクト・行列・AABB・マテリアル色・描画設定を一度だけ集め、
+#   四分割表示やカメラビューなど複数のリージョンでは視錐台カリングと描画のみを行う
+# - depsgraph の更新・フレーム変更・アンドゥ・ファイル読み込み・キャッシュの破棄で無効化し、
+#   次の描画時に作り直す
+# - 静止オブジェクトの結合が有効な場合は結合したセルも保持し、静止待ち・生成直後のオブジェクトがあれば
+#   settle_at の時刻以降の描画で作り直す
+class _sceneSnapshot:
+    def __init__(self, scn):
+        self.scene = scn.as_pointer()
+        self.settle_at = None
+        self.active = bpy.context.active_object
+        self.batched = getattr(scn, "ghost_batched_draw", True)
+        self.material_color = getattr(scn, "ghost_color_mode", 'SINGLE') == 'MATERIAL'
+        self.lod_budget = scn.ghost_lod_budget if getattr(scn, "ghost_lod", False) else 0
+        self.rebuild_budget = getattr(scn, "ghost_rebuild_budget", 8.0)
+        self.cache_limit = getattr(scn, "ghost_cache_limit", 1024) * 1024 * 1024
+        self.line_size = scn.ghost_line_size
+        self.edit_face_color = tuple(scn.edit_ghost_face_color)
+        self.edit_edge_color = tuple(scn.edit_ghost_edge_color)
+        self.object_face_color = tuple(scn.object_ghost_face_color)
+        self.object_edge_color = tuple(scn.object_ghost_edge_color)
+        self.targets = []
+        
+        # ゴースト描画対象（編集中または非表示）のオブジェクトを抽出する
+        # - 描画キャッシュはゴースト描画対象のオブジェクトのみ作成する
+        for obj in [obj for obj in scn.objects if obj.type == 'MESH']:
+            hidden = obj.hide_get()
+            if hidden or obj.mode == 'EDIT':
+                # 初回登場オブジェクトのデータ初期化
+                cache = _draw_objects.get(obj.session_uid)
+                # アンドゥ等でオブジェクトが読み直された場合は形状を再生成する
+                pointer = obj.as_pointer()
+                if cache.pointer != pointer:
+                    if cache.pointer:
+                        _mark_geometry_dirty(cache)
+                    cache.pointer = pointer
+                # ワールド座標の AABB は行列・形状が変わった時のみ再計算する
+                if cache.bounds is None or cache.matrix_world != obj.matrix_world:
+                    if cache.bounds is not None:
+                        cache.moved_at = time.monotonic()
+                    cache.matrix_world = obj.matrix_world.copy()
+                    cache.bounds = gm_core.world_aabb(cache.matrix_world, obj.bound_box)
+                self.targets.append(_ghostTarget(
+                    obj, cache, not hidden, obj.select_get() or obj == self.active,
+                    _slot_mask(obj) if not hidden else None,
+                    _slot_colors(obj) if self.material_color else None))
+            elif obj.session_uid in _draw_objects:
+                # 表示状態に戻ったオブジェクトは描画キャッシュを破棄し、共有バッチの参照やチャンクを手放す
+                _draw_objects.remove(obj.session_uid)
+        
+        # 静止した非表示オブジェクトはセル単位の結合バッチで描画し、個別の描画対象から外す
+        self.cells = []
+        self.merge = getattr(scn, "ghost_merge_static", False)
+        if self.merge:
+            self.targets = _merge_static_targets(self, self.targets, scn.ghost_merge_cell_size)
+        elif _merged_cells:
+            _merged_cells.clear()
+        
+        self.bounds = np.array([target.cache.bounds for target in self.targets])
+        self.cell_bounds = np.array([cell.bounds for cell in self.cells])
+
+_snapshot = None
+
+# 現在のシーンのスナップショットを返す（無効化されている場合・結合待ちの時刻を過ぎた場合は作り直す）
+def _get_snapshot(scn):
+    global _snapshot
+    if (_snapshot is None or _snapshot.scene != scn.as_pointer()
+            or (_snapshot.settle_at is not None and time.monotonic() >= _snapshot.settle_at)):
+        _snapshot = _sceneSnapshot(scn)
+    return _snapshot
+
+# 静止した非表示オブジェクトをワールド座標でまとめた格子セル単位の結合バッチ
+# - signature はメンバーの (session_uid, 共有バッチ, 形状の世代, 最終移動時刻) の一覧で、
+#   メンバーの移動・変形・ghost_hide の変更・メンバーの増減で変わった時のみ作り直す
+class _mergedCell:
+    def __init__(self):
+        self.signature    = None
+        self.uids         = ()
+        self.bounds       = None
+        self.batch_face   = None
+        self.batch_edge   = None
+        self.colors       = None
+        self.tri_count    = 0
+        self.nbytes       = 0
+
+# (セル番号, マテリアル色) をキーとする結合セル
+_merged_cells = {}
+
+# 結合セルの描画に使う単位行列
+_IDENTITY = Matrix.Identity(4)
+
+# 描画対象のうち静止した非表示オブジェクトを格子セルごとの結合バッチにまとめ、残りの描画対象を返す
+# - 編集中・選択中・未生成・三角形数が MERGE_MAX_TRIANGLES を超えるオブジェクトは結合しない
+#   （生成が完了した時点で描画側がスナップショットを作り直させる）
+# - 最後の移動・変形から MERGE_SETTLE 秒経っていないオブジェクトがある場合は
+#   スナップショットを作り直す時刻（settle_at）を設定する
+# - マテリアル色が異なるオブジェクトは別のセルとする
+def _merge_static_targets(snapshot, targets, cell_size):
+    now = time.monotonic()
+    rest = []
+    candidates = []
+    for target in targets:
+        cache = target.cache
+        shared = _shared_batches.get(cache.shared_key)
+        if target.is_edit or target.is_selected:
+            rest.append(target)
+            continue
+        built = cache.is_cache and shared is not None and shared.is_cache and shared.job is None
+        if built and cache.moved_at + MERGE_SETTLE > now:
+            settle = cache.moved_at + MERGE_SETTLE
+            snapshot.settle_at = settle if snapshot.settle_at is None else min(snapshot.settle_at, settle)
+            rest.append(target)
+        elif built and shared.arrays is not None and shared.lods[0][0] <= MERGE_MAX_TRIANGLES:
+            candidates.append((target, shared))
+        else:
+            rest.append(target)
+    
+    members = {}
+    if candidates:
+        cells = gm_core.cell_indices(np.array([target.cache.bounds for target, _ in candidates]), cell_size)
+        for (target, shared), cell in zip(candidates, cells):
+            key = (tuple(cell), target.colors_key if shared.has_slots else None)
+            members.setdefault(key, []).append((target, shared))
+    
+    for key in [key for key in _merged_cells if key not in members]:
+        del _merged_cells[key]
+    for key, items in members.items():
+        cell = _merged_cells.get(key)
+        if cell is None:
+            cell = _merged_cells[key] = _mergedCell()
+        signature = tuple((target.uid, id(shared), shared.generation, target.cache.moved_at) for target, shared in items)
+        if cell.signature != signature:
+            _build_merged_cell(cell, items)
+            cell.signature = signature
+        snapshot.cells.append(cell)
+    return rest
+
+# セルのメンバーの元の形状をワールド座標に変換して 1 つのバッチにまとめる
+def _build_merged_cell(cell, items):
+    co, slots, tris, edges = gm_core.merge_geometry(
+        [shared.arrays + (target.cache.matrix_world,) for target, shared in items])
+    slot_vbo = _slot_vertbuf(slots) if slots is not None and len(co) else None
+    cell.batch_face, cell.batch_edge = _position_batches(
+        co, slot_vbo, _index_buffer('TRIS', tris), _index_buffer('LINES', edges))
+    bounds = np.array([target.cache.bounds for target, _ in items])
+    cell.bounds = np.concatenate((bounds[:, :3].min(axis=0), bounds[:, 3:].max(axis=0)))
+    cell.uids = tuple(target.uid for target, _ in items)
+    cell.colors = items[0][0].colors if slots is not None else None
+    cell.tri_count = len(tris) if tris is not None else 0
+    cell.nbytes = sum(array.nbytes for array in (co, slots, tris, edges) if array is not None)
+
+# 結合セルの統計（セル数・結合したオブジェクト数・三角形数・推定バイト数）
+def merged_stats():
+    cells = list(_merged_cells.values())
+    return {
+        "cells": len(cells),
+        "objects": sum(len(cell.uids) for cell in cells),
+        "triangles": sum(cell.tri_count for cell in cells),
+        "bytes": sum(cell.nbytes for cell in cells),
+    }
+
+# スナップショットを破棄し、次の描画時に作り直させる
+def invalidate_snapshot():
+    global _snapshot
+    _snapshot = None
+
+# リージョンごとの (最後に描画した時刻, 描画したオブジェクトの session_uid の一覧)
+# - メモリ上限を超えた場合に、他のリージョン（四分割表示等）で描画中のキャッシュを破棄しないために使う
+# - スナップショットの作り直しでは失われないよう、スナップショットとは別に保持する
+_region_on_screen = {}
 
 # ビュー上でゴーストメッシュの描画を行うオペレータ
 # - SpaceView3D に draw handler を登録して、各フレームで該当オブジェクトの
@@ -183,7 +929,14 @@ class GM_OT_CustomDraw(bpy.types.Operator):
             return {'RUNNING_MODAL'}
         return {'CANCELLED'}
 
+    # 計測の有効/無効をシーンの設定に合わせ、1 回の描画全体の所要時間を計測する
     def draw_callback():
+        gm_stats.enabled = getattr(bpy.context.scene, "ghost_stats", False)
+        with gm_stats.timer("frame"):
+            GM_OT_CustomDraw.draw_frame()
+
+    def draw_frame():
+        import gpu
         scn = bpy.context.scene
 
         # ビュー行列・射影行列を先に取得し、複数オブジェクトで共有する
@@ -191,109 +944,307 @@ class GM_OT_CustomDraw(bpy.types.Operator):
         proj_matrix = gpu.matrix.get_projection_matrix()
         view_proj = proj_matrix @ view_matrix
 
-        def _is_obj_in_view(obj, cache, view_proj_matrix):
-            try:
-                for corner in obj.bound_box:
-                    world_co = cache.matrix_world @ Vector(corner)
-                    clip = view_proj_matrix @ world_co.to_4d()
-                    w = clip.w
-                    if w == 0.0:
-                        continue
-                    x = clip.x / w
-                    y = clip.y / w
-                    z = clip.z / w
-                    if -1.0 <= x <= 1.0 and -1.0 <= y <= 1.0 and -1.0 <= z <= 1.0:
-                        return True
-                return False
-            except Exception:
-                return True
+        # ゴースト描画対象と描画設定は全リージョンで共有するスナップショットから取得する
+        snapshot = _get_snapshot(scn)
+        if not snapshot.targets and not snapshot.cells:
+            return
 
-        for obj in [obj for obj in scn.objects if obj.type == 'MESH']:
-            # 初回登場オブジェクトのデータ初期化
-            if obj.name not in _draw_objects:
-                _draw_objects[obj.name] = _draw_objectsData()
-            cache = _draw_objects[obj.name]
-            cache.matrix_world = obj.matrix_world.copy()
+        # 視錐台カリング（全オブジェクトの AABB を一括判定）
+        with gm_stats.timer("cull"):
+            planes = gm_core.frustum_planes(view_proj)
+            cells = []
+            if snapshot.cells:
+                cells = [cell for cell, visible in zip(
+                    snapshot.cells, gm_core.aabbs_in_frustum(snapshot.cell_bounds, planes)) if visible]
+            in_view = allowed = ()
+            if snapshot.targets:
+                in_view = gm_core.aabbs_in_frustum(snapshot.bounds, planes)
+                # 画面上の大きさから描画する詳細度を決める（画面全体で ghost_lod_budget 三角形）
+                if snapshot.lod_budget:
+                    allowed = snapshot.lod_budget * np.minimum(gm_core.projected_sizes(snapshot.bounds, view_proj), 1.0) ** 2
+                else:
+                    allowed = np.full(len(snapshot.targets), np.inf)
 
             # 画面外で選択・アクティブでないオブジェクトは処理をスキップ
-            if (not _is_obj_in_view(obj, cache, view_proj)) and (not obj.select_get()) and (obj != bpy.context.active_object):
-                continue
+            drawn = []
+            for target, visible, limit in zip(snapshot.targets, in_view, allowed):
+                if visible or target.is_selected:
+                    drawn.append((target, visible))
+                    cache = target.cache
+                    shared = _shared_batches.get(cache.shared_key)
+                    cache.lod = shared.pick_level(limit) if shared is not None else 0
+
+        # 再生成が必要なキャッシュを優先度順に時間予算内で処理し、残りは後のフレームに回す
+        with gm_stats.timer("rebuild"):
+            tasks = _rebuild_tasks([(target.obj, target.cache, visible) for target, visible in drawn],
+                                   scn, snapshot.active, view_matrix)
+            gm_schedule.run(tasks, snapshot.rebuild_budget)
+            # 生成したオブジェクトを次の描画で結合の対象にする
+            if tasks and snapshot.merge:
+                snapshot.settle_at = time.monotonic()
+
+        with gm_stats.timer("draw"):
+            groups = {}
+            for target, _ in drawn:
+                cache = target.cache
+                if target.is_edit:
+                    gm_jobs.collect_job(cache)
+                    draw_ghost_geometry(
+                        cache, snapshot.edit_face_color,
+                        snapshot.edit_edge_color, snapshot.line_size,
+                        slot_mask=target.slot_mask,
+                        slot_colors=target.colors
+                    )
+                    continue
+                shared = _shared_batches.get(cache.shared_key)
+                if shared is None:
+                    continue
+                if gm_jobs.collect_job(shared) and snapshot.merge:
+                    snapshot.settle_at = time.monotonic()
+                # スロット分割済みのバッチのみマテリアル色で描画する（再生成待ちの間は単色）
+                colors, colors_key = (target.colors, target.colors_key) if shared.has_slots else (None, None)
+                if not snapshot.batched:
+                    draw_ghost_geometry(
+                        cache, snapshot.object_face_color,
+                        snapshot.object_edge_color, snapshot.line_size,
+                        slot_colors=colors
+                    )
+                elif shared.batch_face or shared.batch_edge:
+                    # 一括描画モードでは共有バッチ単位にまとめ、詳細度・マテリアル色が異なるものは別グループとする
+                    key = (cache.shared_key, cache.lod, colors_key)
+                    group = groups.setdefault(key, (shared.level(cache.lod), [], colors))
+                    group[1].append(cache.matrix_world)
+
+            # 結合セルはワールド座標のため単位行列で描画する
+            for cell in cells:
+                if cell.batch_face or cell.batch_edge:
+                    groups[("cell", id(cell))] = ((cell.batch_face, cell.batch_edge), [_IDENTITY], cell.colors)
+
+            draw_ghost_groups(
+                groups, snapshot.object_face_color,
+                snapshot.object_edge_color, snapshot.line_size
+            )
+
+        # 今回描画したキャッシュを LRU の末尾に移し、メモリ上限を超えた分は画面外のキャッシュから破棄する
+        # - いずれかのリージョン（四分割表示等）で描画中のキャッシュは破棄しない
+        # - 破棄したキャッシュをスナップショットが参照し続けないよう、破棄した場合は作り直す
+        # - 結合セルのメンバーは形状の配列をセルの作り直しに使うため破棄しない
+        for target, _ in drawn:
+            _draw_objects.touch(target.uid)
+        now = time.monotonic()
+        _region_on_screen[bpy.context.region.as_pointer()] = (now, [target.uid for target, _ in drawn])
+        def keep():
+            for region in [region for region, (drawn_at, _) in _region_on_screen.items()
+                           if now - drawn_at > ON_SCREEN_KEEP]:
+                del _region_on_screen[region]
+            uids = set(itertools.chain.from_iterable(uids for _, uids in _region_on_screen.values()))
+            for cell in snapshot.cells:
+                uids.update(cell.uids)
+            return uids
+        if _draw_objects.evict(snapshot.cache_limit, keep):
+            invalidate_snapshot()
 
-            if obj.mode == 'EDIT' and not obj.hide_get():
-                if not cache.is_cache:
-                    update_mesh_cache(obj, scn, cache)
-                draw_ghost_geometry(
-                    cache, scn.edit_ghost_face_color, 
-                    scn.edit_ghost_edge_color, scn.ghost_line_size
-                )
-            elif obj.hide_get():
-                if not cache.is_cache:
-                    update_object_cache(obj, scn, cache)
-                draw_ghost_geometry(
-                    cache, scn.object_ghost_face_color, 
-                    scn.object_ghost_edge_color, scn.ghost_line_size
-                )
+# シーン内のオブジェクトとメッシュデータの対応を保持するインデックス
+# - オブジェクトの追加・削除・名前変更を検出した時のみ再構築し、
+#   depsgraph の更新ごとに全オブジェクトを走査しないようにする
+class _sceneIndex:
+    def __init__(self):
+        self.is_valid   = False
+        self.scene_name = None
+        self.objects    = {}  # オブジェクトの session_uid -> メッシュデータ名（メッシュ以外は None）
+        self.mesh_users = {}  # メッシュデータ名 -> 参照するオブジェクトの session_uid の集合
+        self.unknown    = set()  # 再構築後もインデックスに無かった session_uid・メッシュデータ名
+    
+    def rebuild(self, scn):
+        self.scene_name = scn.name
+        self.objects = {}
+        self.mesh_users = {}
+        self.unknown = set()
+        for obj in scn.objects:
+            self._link(obj.session_uid, obj.data.name_full if obj.type == 'MESH' else None)
+        self.is_valid = True
+    
+    # オブジェクトが参照するメッシュデータが差し替えられた場合に対応を更新する
+    def relink(self, obj):
+        old_mesh = self.objects.get(obj.session_uid)
+        new_mesh = obj.data.name_full if obj.type == 'MESH' else None
+        if old_mesh != new_mesh:
+            self._unlink(obj.session_uid, old_mesh)
+            self._link(obj.session_uid, new_mesh)
+    
+    def _link(self, uid, mesh_name):
+        self.objects[uid] = mesh_name
+        if mesh_name is not None:
+            self.mesh_users.setdefault(mesh_name, set()).add(uid)
+    
+    def _unlink(self, uid, mesh_name):
+        users = self.mesh_users.get(mesh_name)
+        if users is not None:
+            users.discard(uid)
+            if not users:
+                del self.mesh_users[mesh_name]
+
+_scene_index = _sceneIndex()
+
+# シーンインデックスを再構築し、削除されたオブジェクトの描画キャッシュを破棄する
+# - 他のシーンにのみリンクされたオブジェクトのキャッシュは残し、LRU による破棄に任せる
+# - オブジェクト構成が変わったため UI のオブジェクト一覧も同期する
+def _rebuild_scene_index(scn):
+    _scene_index.rebuild(scn)
+    alive = {obj.session_uid for obj in bpy.data.objects}
+    for uid in [uid for uid in _draw_objects.keys() if uid not in alive]:
+        _draw_objects.remove(uid)
+    with gm_stats.timer("list_sync"):
+        gm_prop.update_mesh_object_list(scn)
 
 # .blend ファイル読み込み後にドローハンドラを起動するハンドラ
 @persistent
 def load_handler(dummy):
+    _scene_index.is_valid = False
+    invalidate_snapshot()
+    _region_on_screen.clear()
     bpy.ops.gm.custom_draw('INVOKE_DEFAULT')
 
+# アンドゥ/リドゥ後にシーンインデックスを作り直すハンドラ
+# - 描画キャッシュは session_uid で引き継ぎ、読み直されたオブジェクトのみ描画時に再生成する
+@persistent
+def undo_handler(scn, *args):
+    _scene_index.is_valid = False
+    invalidate_snapshot()
+
+# フレーム変更時のハンドラ
+# - 再生中は depsgraph_update_post が呼ばれないため、フレームの評価で更新された ID を
+#   depsgraph_update_handler と同様に処理し、アーマチュア・シェイプキー・モディファイア等で
+#   変形した非表示オブジェクトのゴーストを更新対象にする（トポロジーが同じなら座標のみ更新される）
+@persistent
+def frame_change_handler(scn, depsgraph=None):
+    invalidate_snapshot()
+    if depsgraph is None:
+        return
+    with gm_stats.timer("handler"):
+        _handle_depsgraph_updates(scn, depsgraph)
+
 # depsgraph の更新を監視して描画キャッシュや UI を更新するハンドラ
 # - メッシュ/オブジェクトの変更を検出し、必要に応じてキャッシュを無効化する
+# - メッシュから利用オブジェクトへの逆引きはシーンインデックスを用い、
+#   処理量は更新の数に比例する（インデックスの再構築は構成変更時のみ）
+# - インデックスに無い ID による再構築は 1 回の呼び出しにつき 1 度までとし、
+#   再構築後も見つからない ID（インスタンス化・リンクされたコレクション内のオブジェクトや
+#   シーンで使われていないメッシュ）は次の構成変更まで再構築の契機にしない
+# - オブジェクトは session_uid で識別するため、名前変更ではキャッシュを作り直さない
+# - UI のオブジェクト一覧はインデックス再構築時（構成変更時）のみ同期する
 @persistent
 def depsgraph_update_handler(scn, depsgraph):
+    invalidate_snapshot()
+    with gm_stats.timer("handler"):
+        _handle_depsgraph_updates(scn, depsgraph)
+
+# depsgraph の更新一覧を処理する（depsgraph_update_handler の本体）
+def _handle_depsgraph_updates(scn, depsgraph):
     
-    all_names = {obj.name for obj in scn.objects}
-    for name in list(_draw_objects.keys()):
-        if name not in all_names:
-            del _draw_objects[name]
+    index = _scene_index
+    rebuilt = False
+    if not index.is_valid or index.scene_name != scn.name:
+        _rebuild_scene_index(scn)
+        rebuilt = True
     
-    needs_ui_refresh = False
     for update in depsgraph.updates:
         if isinstance(update.id, bpy.types.Mesh):
-            mesh_name = update.id.name
-            for obj in scn.objects:
-                if obj.type == 'MESH' and obj.data.name == mesh_name:
-                    if obj.name in _draw_objects:
-                        _draw_objects[obj.name].is_cache = False
+            name = update.id.name_full
+            users = index.mesh_users.get(name)
+            if users is None:
+                # 名前変更などでインデックスに無いメッシュは一度だけ再構築して引き直す
+                if not rebuilt and name not in index.unknown:
+                    _rebuild_scene_index(scn)
+                    rebuilt = True
+                    users = index.mesh_users.get(name)
+                if users is None:
+                    index.unknown.add(name)
+                    continue
+            for uid in users:
+                state = _draw_objects.peek(uid)
+                if state is not None:
+                    _mark_geometry_dirty(state)
         elif isinstance(update.id, bpy.types.Object):
-            obj_name = update.id.name
-            if obj_name in _draw_objects:
-                state = _draw_objects[obj_name]
-                obj = update.id
-                if update.is_updated_geometry or obj.hide_get() != state.is_display:
+            obj = update.id
+            if obj.session_uid not in index.objects:
+                # 追加されたオブジェクト
+                if not rebuilt and obj.session_uid not in index.unknown:
+                    _rebuild_scene_index(scn)
+                    rebuilt = True
+                if obj.session_uid not in index.objects:
+                    index.unknown.add(obj.session_uid)
+                    continue
+            else:
+                index.relink(obj)
+            state = _draw_objects.peek(obj.session_uid)
+            if state is not None:
+                if update.is_updated_geometry:
+                    _mark_geometry_dirty(state)
+                if obj.hide_get() != state.is_display:
                     state.is_cache = False
                     state.is_display = obj.hide_get()
-        if isinstance(update.id, (bpy.types.Scene, bpy.types.Object)):
-            needs_ui_refresh = True
-            break
-            
-    if needs_ui_refresh:
-        gm_prop.update_mesh_object_list(scn)
+        elif isinstance(update.id, (bpy.types.Scene, bpy.types.Collection)):
+            # リンク解除・削除されたオブジェクトはオブジェクト数の変化で検出する
+            if len(scn.objects) != len(index.objects):
+                _rebuild_scene_index(scn)
+                rebuilt = True
 
+# オブジェクトごとの描画カウンタ（三角形数・辺数・保持バイト数・再生成回数）の一覧を返す
+# - 統計の書き出し用で、描画中は集計しない
+def object_stats():
+    names = {obj.session_uid: obj.name_full for obj in bpy.data.objects}
+    result = []
+    for uid, cache in zip(_draw_objects.keys(), _draw_objects.values()):
+        if cache.chunks:
+            tri_count = sum(chunk.tri_count for chunk in cache.chunks.values())
+            edge_count = sum(chunk.edge_count for chunk in cache.chunks.values())
+        else:
+            shared = _shared_batches.get(cache.shared_key)
+            if shared is not None and shared.lods:
+                tri_count, edge_count, _, _ = shared.lods[min(cache.lod, len(shared.lods) - 1)]
+            else:
+                tri_count = edge_count = 0
+        result.append({
+            "object": names.get(uid),
+            "triangles": tri_count,
+            "edges": edge_count,
+            "lod": cache.lod,
+            "bytes": int(_cache_bytes(cache)),
+            "rebuilds": cache.rebuilds,
+            "refreshes": cache.refreshes,
+        })
+    return result
 
 # 全オブジェクトの描画キャッシュを無効化し、View3D を再描画するユーティリティ
 # - プロパティの変更（チェックボックス等）や外部イベントから呼び出して使用する
 def invalidate_all_caches():
+    invalidate_snapshot()
     for state in _draw_objects.values():
         state.is_cache = False
+    for shared in _shared_batches.values():
+        shared.is_cache = False
     for area in bpy.context.screen.areas:
         if area.type == 'VIEW_3D':
             area.tag_redraw()
 
-
 # アドオン登録処理: オペレータの登録とハンドラの追加を行う
 # 注意: draw handler の追加は operator.invoke 内で行われる
 def register():
     bpy.utils.register_class(GM_OT_CustomDraw)
     bpy.app.handlers.load_post.append(load_handler)
+    bpy.app.handlers.undo_post.append(undo_handler)
+    bpy.app.handlers.redo_post.append(undo_handler)
     bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_handler)
-
+    bpy.app.handlers.frame_change_post.append(frame_change_handler)
 
 # アドオン解除処理: ハンドラの削除とオペレータの登録解除を行う
 def unregister():
+    invalidate_snapshot()
+    bpy.app.handlers.frame_change_post.remove(frame_change_handler)
     bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update_handler)
+    bpy.app.handlers.redo_post.remove(undo_handler)
+    bpy.app.handlers.undo_post.remove(undo_handler)
     bpy.app.handlers.load_post.remove(load_handler)
     bpy.utils.unregister_class(GM_OT_CustomDraw)
 
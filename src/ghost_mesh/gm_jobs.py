@@ -0,0 +1,81 @@
+import bpy
+from concurrent.futures import ThreadPoolExecutor
+
+# ゴースト形状をバックグラウンドで生成するワーカースレッド数
+MAX_WORKERS = 2
+
+# 生成完了を確認するタイマーの間隔（秒）
+POLL_INTERVAL = 0.05
+
+_executor = None
+_in_flight = []
+
+# ワーカースレッドプールを取得する（初回呼び出しで作成）
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="ghost_mesh")
+    return _executor
+
+# ゴースト形状の生成を開始する
+# - build はワーカースレッドで実行されるため、配列のみを扱い bpy にはアクセスしない
+# - apply は collect_job からメインスレッド（描画時）に呼ばれ、GPU バッチを作成する
+# - バックグラウンド生成が無効な場合はその場で build と apply を実行する
+def start_job(target, scn, build, args, apply):
+    if not getattr(scn, "ghost_background_build", True):
+        target.job = None
+        apply(target, build(*args))
+        return
+    future = _get_executor().submit(build, *args)
+    target.job = (future, apply)
+    _in_flight.append(future)
+    if not bpy.app.timers.is_registered(_poll_jobs):
+        bpy.app.timers.register(_poll_jobs, first_interval=POLL_INTERVAL)
+
+# 完了した生成結果を対象に反映する
+# - 未完了の場合は何もしないため、新しいバッチができるまで以前のバッチが描画される
+def collect_job(target):
+    job = target.job
+    if job is None or not job[0].done():
+        return False
+    target.job = None
+    future, apply = job
+    try:
+        result = future.result()
+    except Exception as e:
+        print(f"Ghost build failed: {e}")
+        return False
+    apply(target, result)
+    return True
+
+# 全ウィンドウの View3D を再描画する（タイマーなど context.screen が無い場面でも使用可能）
+def tag_redraw_view3d():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+# 完了した生成処理があれば View3D を再描画し、結果を描画時に反映させる
+def _poll_jobs():
+    finished = [future for future in _in_flight if future.done()]
+    if finished:
+        for future in finished:
+            _in_flight.remove(future)
+        tag_redraw_view3d()
+    return POLL_INTERVAL if _in_flight else None
+
+
+# 登録処理
+def register():
+    pass
+
+
+# 解除処理: 確認タイマーを止め、未開始の生成処理を破棄する
+def unregister():
+    global _executor
+    if bpy.app.timers.is_registered(_poll_jobs):
+        bpy.app.timers.unregister(_poll_jobs)
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    _in_flight.clear()
@@ -1,8 +1,11 @@
 import bpy
-import bmesh
+import numpy as np
 from bpy.types import Panel, UIList, Operator, PropertyGroup, Object
 from bpy.props import IntProperty, FloatProperty, FloatVectorProperty, BoolProperty, CollectionProperty, StringProperty, PointerProperty
+from . import gm_disk
 from . import gm_draw
+from . import gm_schedule
+from . import gm_shader
 
 # VIEW3D の全エリアを再描画して UI を最新状態に更新するヘルパー関数
 def tag_redraw_all_view3d():
@@ -10,10 +13,11 @@ def tag_redraw_all_view3d():
         if area.type == 'VIEW_3D':
             area.tag_redraw()
 
-# 指定されたオブジェクト名の描画キャッシュを無効化し、次回描画時に再生成させる
-def set_cache_dirty(obj_name):
-    if obj_name in gm_draw._draw_objects:
-        gm_draw._draw_objects[obj_name].is_cache = False
+# 指定されたオブジェクトの描画キャッシュを無効化し、次回描画時に再生成させる
+def set_cache_dirty(obj):
+    cache = gm_draw._draw_objects.peek(obj.session_uid)
+    if cache is not None:
+        cache.is_cache = False
 
 # 共通: オブジェクト一覧と表示設定セクションを描画するヘルパー
 # - Object モードと Edit パネルで共通して使用される UI ブロックをまとめる
@@ -21,11 +25,69 @@ def _draw_shared_object_section(layout, scn, rows=5):
     """Draw the shared object list and object-level ghost settings."""
     row = layout.row()
     row.template_list("GM_UL_ObjectItems", "object_list", scn, "mesh_objects", scn, "mesh_objects_index", rows=rows)
+    # 一覧で選択中のオブジェクトのゴーストの生成元
+    if 0 <= scn.mesh_objects_index < len(scn.mesh_objects):
+        obj = scn.mesh_objects[scn.mesh_objects_index].object_ref
+        if obj is not None:
+            layout.prop(obj, "ghost_source", text="Object ghost source")
 
     layout.prop(scn, "object_ghost_display_edge"  , text="Object Ghosting Display(Edge)")
     layout.prop(scn, "object_ghost_display_face"  , text="Object Ghosting Display(Face)")
     layout.prop(scn, "object_ghost_edge_color", text="Object Edge color")
+    layout.prop(scn, "object_ghost_edge_mode", text="Object Edge mode")
+    row = layout.row()
+    row.enabled = scn.object_ghost_edge_mode == 'FEATURE'
+    row.prop(scn, "object_ghost_feature_angle", text="Feature angle")
     layout.prop(scn, "object_ghost_face_color", text="Object Face color")
+    layout.prop(scn, "ghost_color_mode", text="Ghost color")
+    layout.prop(scn, "ghost_batched_draw", text="Batched drawing")
+    layout.prop(scn, "ghost_merge_static", text="Merge static objects")
+    row = layout.row()
+    row.enabled = scn.ghost_merge_static
+    row.prop(scn, "ghost_merge_cell_size", text="Cell size")
+    layout.prop(scn, "ghost_source", text="Ghost source")
+    row = layout.row()
+    row.enabled = scn.ghost_source == 'PROXY'
+    row.prop(scn, "ghost_proxy_triangles", text="Proxy triangles")
+    layout.prop(scn, "ghost_lod", text="Level of detail")
+    row = layout.row()
+    row.enabled = scn.ghost_lod
+    row.prop(scn, "ghost_lod_budget", text="Triangle budget")
+    layout.prop(scn, "ghost_background_build", text="Background build")
+    layout.prop(scn, "ghost_rebuild_budget", text="Rebuild budget (ms)")
+    layout.prop(scn, "ghost_cache_limit", text="Cache limit (MB)")
+    layout.prop(scn, "ghost_disk_cache", text="Disk cache")
+    col = layout.column(align=True)
+    col.enabled = scn.ghost_disk_cache
+    col.prop(scn, "ghost_disk_cache_dir", text="")
+    col.prop(scn, "ghost_disk_cache_limit", text="Disk cache limit (MB)")
+    
+    layout.prop(scn, "ghost_stats", text="Instrumentation")
+    row = layout.row(align=True)
+    row.enabled = scn.ghost_stats
+    row.prop(scn, "ghost_stats_hud", text="Show HUD")
+    row.operator("gm.export_stats", text="Export", icon='EXPORT')
+    
+    # 描画キャッシュの統計
+    stats = gm_draw._draw_objects.stats()
+    col = layout.column(align=True)
+    col.label(text=bpy.app.translations.pgettext("Ghost cache") +
+              f": {stats['entries']} / {stats['bytes'] / (1024 * 1024):.1f} MB")
+    col.label(text=f"hit {stats['hits']}  miss {stats['misses']}  evict {stats['evictions']}")
+    if scn.ghost_merge_static:
+        merged = gm_draw.merged_stats()
+        col.label(text=bpy.app.translations.pgettext("Merged cells") +
+                  f": {merged['cells']} ({merged['objects']})")
+    for disk in gm_disk.all_stats():
+        col.label(text=bpy.app.translations.pgettext("Disk cache") +
+                  f": {disk['entries']} / {disk['bytes'] / (1024 * 1024):.1f} MB")
+        col.label(text=f"hit {disk['hits']}  miss {disk['misses']}  evict {disk['evictions']}")
+    
+    # 再生成の進捗
+    done, total = gm_schedule.progress()
+    if total and done < total:
+        text = bpy.app.translations.pgettext("Rebuilding ghosts") + f" {done}/{total}"
+        layout.progress(factor=done / total, type='BAR', text=text)
 
 # オブジェクト一覧 UIList
 # - 各オブジェクトの名前と表示/ゴースト切替ボタンを描画する
@@ -59,7 +121,7 @@ class GM_OT_GhostObjectDisplayToggle(bpy.types.Operator):
         obj = context.scene.objects.get(self.target_name)
         if obj:
             obj.hide_set(not obj.hide_get())
-            set_cache_dirty(obj.name)
+            set_cache_dirty(obj)
             tag_redraw_all_view3d()
         return {'FINISHED'}
 
@@ -75,7 +137,7 @@ class GM_OT_GhostObjectTranslucentToggle(bpy.types.Operator):
         obj = context.scene.objects.get(self.target_name)
         if obj:
             obj.ghost_hide = not obj.ghost_hide
-            set_cache_dirty(obj.name)
+            set_cache_dirty(obj)
             tag_redraw_all_view3d()
         return {'FINISHED'}
 
@@ -113,8 +175,58 @@ class GM_UL_MaterialItems(bpy.types.UIList):
         else:
             layout.label(text="Missing Material")
 
+# 指定マテリアルの面の表示/非表示を配列で一括更新する（オブジェクトモード用）
+# - material_index が None の場合はすべての頂点・辺・面を表示する
+# - 頂点は表示中の面に使われていなければ非表示、辺は両端のどちらかが非表示なら非表示とする
+def _set_material_hide_arrays(mesh, material_index, visible):
+    n_vert, n_edge, n_poly = len(mesh.vertices), len(mesh.edges), len(mesh.polygons)
+    if material_index is None:
+        face_hide = np.zeros(n_poly, dtype=bool)
+        vert_hide = np.zeros(n_vert, dtype=bool)
+        edge_hide = np.zeros(n_edge, dtype=bool)
+    else:
+        face_hide = np.empty(n_poly, dtype=bool)
+        mat_index = np.empty(n_poly, dtype=np.int32)
+        mesh.polygons.foreach_get("hide", face_hide)
+        mesh.polygons.foreach_get("material_index", mat_index)
+        target = (mat_index == material_index)
+        face_hide = (face_hide & ~target) if visible else (face_hide | target)
+        
+        loop_total = np.empty(n_poly, dtype=np.int32)
+        loop_vert = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_total)
+        mesh.loops.foreach_get("vertex_index", loop_vert)
+        vert_hide = np.ones(n_vert, dtype=bool)
+        vert_hide[loop_vert[np.repeat(~face_hide, loop_total)]] = False
+        
+        edge_verts = np.empty(n_edge * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edge_verts)
+        edge_hide = vert_hide[edge_verts[0::2]] | vert_hide[edge_verts[1::2]]
+    
+    mesh.polygons.foreach_set("hide", face_hide)
+    mesh.vertices.foreach_set("hide", vert_hide)
+    mesh.edges.foreach_set("hide", edge_hide)
+    mesh.update()
+
+# 指定マテリアルの面の表示/非表示を BMesh で更新する（編集モード用）
+# - 面は対象マテリアルのみ書き換え、頂点・辺はそれぞれ 1 回の走査で反映する
+def _set_material_hide_bmesh(bm, material_index, visible):
+    if material_index is None:
+        for f in bm.faces: f.hide = False
+        for v in bm.verts: v.hide = False
+        for e in bm.edges: e.hide = False
+        return
+    hide = not visible
+    for f in bm.faces:
+        if f.material_index == material_index:
+            f.hide = hide
+    for v in bm.verts:
+        v.hide = all(f.hide for f in v.link_faces)
+    for e in bm.edges:
+        e.hide = e.verts[0].hide or e.verts[1].hide
+
 # 編集モード内でマテリアル別に表示/非表示を切り替えるオペレータ
-# - 編集モードの場合は BMesh を、オブジェクトモードの場合は一時 BMesh を用いてメッシュを更新する
+# - 編集モードの場合は BMesh を、オブジェクトモードの場合は属性配列を一括で更新する
 class GM_OT_GhostMeshDisplayToggle(bpy.types.Operator):
     bl_idname = "object.ghost_mesh_display_toggle"
     bl_label = bpy.app.translations.pgettext("Mesh display/hide")
@@ -127,55 +239,33 @@ class GM_OT_GhostMeshDisplayToggle(bpy.types.Operator):
         obj = context.active_object
         if not obj or obj.type != 'MESH': return {'CANCELLED'}
         
-        is_edit = (obj.mode == 'EDIT')
-        bm = bmesh.from_edit_mesh(obj.data) if is_edit else bmesh.new()
-        if not is_edit: bm.from_mesh(obj.data)
-
         if self.selected == -1: # Show All
-            for f in bm.faces: f.hide = False
-            for v in bm.verts: v.hide = False
-            for e in bm.edges: e.hide = False
             for mat_slot in obj.material_slots:
-                setattr(mat_slot.material, "ghost_visible", True)
+                if mat_slot.material:
+                    setattr(mat_slot.material, "ghost_visible", True)
+            material_index, visible = None, True
         else:
             mat = obj.material_slots[self.selected].material
-            material_index = self.selected
-            if mat:
-                mat.ghost_visible = not getattr(mat, "ghost_visible", True)
-                
-                bm.verts.ensure_lookup_table()
-                bm.edges.ensure_lookup_table()
-                bm.faces.ensure_lookup_table()
-                for v in bm.verts:
-                    v.hide = True
-                for e in bm.edges:
-                    e.hide = False
-                if getattr(mat, "ghost_visible", False):
-                    for f in bm.faces:
-                        if f.material_index == material_index or f.hide == False:
-                            f.hide = False
-                            for v in f.verts: v.hide = False
-                else:
-                    for f in bm.faces:
-                        if f.material_index == material_index:
-                            f.hide = True
-                        elif not f.hide:
-                            for v in f.verts: v.hide = False
-                for e in bm.edges:
-                    if e.verts[0].hide or e.verts[1].hide:
-                        e.hide = True
-        if is_edit:
+            if not mat:
+                return {'CANCELLED'}
+            mat.ghost_visible = not getattr(mat, "ghost_visible", True)
+            material_index, visible = self.selected, mat.ghost_visible
+        
+        if obj.mode == 'EDIT':
+            import bmesh
+            bm = bmesh.from_edit_mesh(obj.data)
+            _set_material_hide_bmesh(bm, material_index, visible)
             bmesh.update_edit_mesh(obj.data)
         else:
-            bm.to_mesh(obj.data)
-            bm.free()
+            _set_material_hide_arrays(obj.data, material_index, visible)
 
-        set_cache_dirty(obj.name)
+        set_cache_dirty(obj)
         tag_redraw_all_view3d()
         return {'FINISHED'}
 
 # マテリアル単位でゴースト（半透明）表示を切り替えるオペレータ
 # - アクティブオブジェクトのマテリアルスロットを参照し、`ghost_hide` を切り替える
+# - 編集モードのゴーストは描画時にマスクするため、切替時にバッチを再生成しない
 class GM_OT_GhostMeshTranslucentToggle(bpy.types.Operator):
     bl_idname = "object.ghost_mesh_translucent_toggle"
     bl_label = bpy.app.translations.pgettext("Display switching")
@@ -191,7 +281,9 @@ class GM_OT_GhostMeshTranslucentToggle(bpy.types.Operator):
                 return {'CANCELLED'}
             mat = obj.material_slots[self.selected].material
             mat.ghost_hide = True if not mat.ghost_hide else False
-            set_cache_dirty(obj.name)
+            # シェーダーのマスクで除外できる場合はバッチの再生成は不要
+            if not gm_shader.slot_mask_supported():
+                set_cache_dirty(obj)
             tag_redraw_all_view3d()
             return {'FINISHED'}
         else:
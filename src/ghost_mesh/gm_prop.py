@@ -1,8 +1,7 @@
 import bpy
-import bmesh
 from bpy.app.handlers import persistent
 from bpy.types import Panel, UIList, Operator, PropertyGroup, Object
-from bpy.props import IntProperty, FloatProperty, FloatVectorProperty, BoolProperty, CollectionProperty, StringProperty, PointerProperty
+from bpy.props import IntProperty, FloatProperty, FloatVectorProperty, BoolProperty, CollectionProperty, StringProperty, PointerProperty, EnumProperty
 
 
 # メッシュオブジェクトアイテム
@@ -11,16 +10,39 @@ class MeshObjectItem(bpy.types.PropertyGroup):
     object_ref: bpy.props.PointerProperty(type=bpy.types.Object)
 
 def update_mesh_object_list(scn):
-    """シーン内の全メッシュオブジェクトをUIリストに同期する"""
-    # 既存のリストをクリア
-    scn.mesh_objects.clear()
+    """シーン内の全メッシュオブジェクトをUIリストに同期する（差分のみ反映）"""
+    items = scn.mesh_objects
+    index = scn.mesh_objects_index
     
-    # メッシュオブジェクトのみを抽出して登録
-    for obj in scn.objects:
-        if obj.type == 'MESH':
-            item = scn.mesh_objects.add()
+    # シーン内のメッシュオブジェクト（名前 -> オブジェクト）
+    targets = {obj.name: obj for obj in scn.objects if obj.type == 'MESH'}
+    
+    # シーンから消えた項目を削除し、名前が変わった項目を更新
+    # - 後ろから走査して削除によるインデックスのずれを避ける
+    listed = set()
+    for i in range(len(items) - 1, -1, -1):
+        item = items[i]
+        obj = item.object_ref
+        if obj is None or targets.get(obj.name) != obj or obj.name in listed:
+            items.remove(i)
+            if i < index:
+                index -= 1
+            continue
+        listed.add(obj.name)
+        if item.name != obj.name:
             item.name = obj.name
+    
+    # 新しく追加されたメッシュオブジェクトを末尾に登録
+    for name, obj in targets.items():
+        if name not in listed:
+            item = items.add()
+            item.name = name
             item.object_ref = obj
+    
+    # 選択中の項目を維持する
+    index = min(max(index, 0), max(len(items) - 1, 0))
+    if scn.mesh_objects_index != index:
+        scn.mesh_objects_index = index
 
 # ゴースト表示用の Bool プロパティが変更された際に呼ばれるコールバック
 # - gm_draw.invalidate_all_caches を呼んで全キャッシュを無効化し、View3D を再描画する
@@ -31,6 +53,32 @@ def _on_ghost_prop_update(self, context):
         if area.type == 'VIEW_3D':
             area.tag_redraw()
 
+# 計測の有効/無効が切り替わった際に呼ばれるコールバック
+def _on_stats_update(self, context):
+    from . import gm_stats
+    gm_stats.enabled = self.ghost_stats
+    if not self.ghost_stats:
+        gm_stats.reset()
+
+# オブジェクトのゴーストの生成元が変更された際に呼ばれるコールバック
+# - 変更されたオブジェクトの描画キャッシュのみを無効化する（共有バッチは生成元ごとに別に持つ）
+def _on_object_source_update(self, context):
+    from . import gm_draw
+    cache = gm_draw._draw_objects.peek(self.session_uid)
+    if cache is not None:
+        cache.is_cache = False
+    gm_draw.invalidate_snapshot()
+    for area in context.screen.areas:
+        if area.type == 'VIEW_3D':
+            area.tag_redraw()
+
+# ゴーストの生成元の選択肢
+GHOST_SOURCE_ITEMS = [
+    ('EVALUATED', "Evaluated", "Use the mesh with all modifiers applied"),
+    ('CAGE', "Cage", "Use the base mesh without evaluating modifiers"),
+    ('PROXY', "Proxy", "Use the evaluated mesh simplified to the proxy triangle limit"),
+]
+
 # プロパティの初期化
 def init_props():
     
@@ -69,6 +117,20 @@ def init_props():
         name=bpy.app.translations.pgettext("Object Edge color"),
         description=bpy.app.translations.pgettext("Hidden edge color"),
         subtype='COLOR', default=[0.8, 0.8, 0.0, 0.1], size=4, min=0.0, max=1.0)
+    bpy.types.Scene.object_ghost_edge_mode = EnumProperty(
+        name=bpy.app.translations.pgettext("Object Edge mode"),
+        description=bpy.app.translations.pgettext("Which edges of hidden objects are drawn"),
+        items=[
+            ('ALL', "All", "Draw every edge"),
+            ('FEATURE', "Feature", "Draw only boundary, non-manifold and sharp edges"),
+        ],
+        default='ALL',
+        update=_on_ghost_prop_update)
+    bpy.types.Scene.object_ghost_feature_angle = FloatProperty(
+        name=bpy.app.translations.pgettext("Feature angle"),
+        description=bpy.app.translations.pgettext("Edges whose adjacent faces meet at a larger angle are drawn as feature edges"),
+        subtype='ANGLE', default=0.523599, min=0.0, max=3.141593,
+        update=_on_ghost_prop_update)
     bpy.types.Scene.object_ghost_face_color = FloatVectorProperty(
         name=bpy.app.translations.pgettext("Object Face color"),
         description=bpy.app.translations.pgettext("Hidden surface color"),
@@ -81,22 +143,123 @@ def init_props():
         description=bpy.app.translations.pgettext("Line size"),
         default=2.0, min=1.0, max=5.0)
     
+    bpy.types.Scene.ghost_color_mode = EnumProperty(
+        name=bpy.app.translations.pgettext("Ghost color"),
+        description=bpy.app.translations.pgettext("How ghost faces are colored"),
+        items=[
+            ('SINGLE', "Single", "Use the face color for every ghost"),
+            ('MATERIAL', "Material", "Use each material's viewport display color with the face color's alpha"),
+        ],
+        default='SINGLE',
+        update=_on_ghost_prop_update)
+    bpy.types.Scene.ghost_lod = BoolProperty(
+        name=bpy.app.translations.pgettext("Level of detail"),
+        description=bpy.app.translations.pgettext("Draw simplified ghosts for hidden objects that are small on screen or very dense"),
+        default=True,
+        update=_on_ghost_prop_update)
+    bpy.types.Scene.ghost_source = EnumProperty(
+        name=bpy.app.translations.pgettext("Ghost source"),
+        description=bpy.app.translations.pgettext("Which mesh hidden objects' ghosts are built from"),
+        items=GHOST_SOURCE_ITEMS,
+        default='EVALUATED',
+        update=_on_ghost_prop_update)
+    bpy.types.Scene.ghost_proxy_triangles = IntProperty(
+        name=bpy.app.translations.pgettext("Proxy triangles"),
+        description=bpy.app.translations.pgettext("Maximum triangles kept in a proxy ghost"),
+        default=20000, min=256, max=10000000,
+        update=_on_ghost_prop_update)
+    bpy.types.Scene.ghost_lod_budget = IntProperty(
+        name=bpy.app.translations.pgettext("Triangle budget"),
+        description=bpy.app.translations.pgettext("Maximum triangles drawn for a hidden object that fills the view"),
+        default=250000, min=1000, max=10000000,
+        update=_on_ghost_prop_update)
+    bpy.types.Scene.ghost_batched_draw = BoolProperty(
+        name=bpy.app.translations.pgettext("Batched drawing"),
+        description=bpy.app.translations.pgettext("Draw hidden objects that share geometry together in one call"),
+        default=True)
+    bpy.types.Scene.ghost_merge_static = BoolProperty(
+        name=bpy.app.translations.pgettext("Merge static objects"),
+        description=bpy.app.translations.pgettext("Bake hidden objects that stay still into one world-space batch per grid cell"),
+        default=False)
+    bpy.types.Scene.ghost_merge_cell_size = FloatProperty(
+        name=bpy.app.translations.pgettext("Cell size"),
+        description=bpy.app.translations.pgettext("Size of the grid cells that static hidden objects are merged into"),
+        subtype='DISTANCE', default=20.0, min=0.1, max=100000.0)
+    bpy.types.Scene.ghost_background_build = BoolProperty(
+        name=bpy.app.translations.pgettext("Background build"),
+        description=bpy.app.translations.pgettext("Build ghost geometry in worker threads and keep showing the previous ghost until it is ready"),
+        default=True)
+    bpy.types.Scene.ghost_stats = BoolProperty(
+        name=bpy.app.translations.pgettext("Instrumentation"),
+        description=bpy.app.translations.pgettext("Measure time spent in each ghost rendering stage"),
+        default=False,
+        update=_on_stats_update)
+    bpy.types.Scene.ghost_stats_hud = BoolProperty(
+        name=bpy.app.translations.pgettext("Show HUD"),
+        description=bpy.app.translations.pgettext("Show ghost rendering time in the 3D viewport"),
+        default=False)
+    bpy.types.Scene.ghost_cache_limit = IntProperty(
+        name=bpy.app.translations.pgettext("Cache limit (MB)"),
+        description=bpy.app.translations.pgettext("GPU memory kept for ghost caches; caches of objects off screen are released first when exceeded"),
+        default=1024, min=16, max=65536)
+    bpy.types.Scene.ghost_disk_cache = BoolProperty(
+        name=bpy.app.translations.pgettext("Disk cache"),
+        description=bpy.app.translations.pgettext("Keep built ghost geometry on disk so reopened files skip rebuilding unchanged meshes"),
+        default=False)
+    bpy.types.Scene.ghost_disk_cache_dir = StringProperty(
+        name=bpy.app.translations.pgettext("Disk cache folder"),
+        description=bpy.app.translations.pgettext("Folder for the ghost disk cache; the system temporary folder is used when empty"),
+        subtype='DIR_PATH', default="")
+    bpy.types.Scene.ghost_disk_cache_limit = IntProperty(
+        name=bpy.app.translations.pgettext("Disk cache limit (MB)"),
+        description=bpy.app.translations.pgettext("Disk space kept for the ghost disk cache; least recently used entries are deleted first when exceeded"),
+        default=2048, min=16, max=1048576)
+    bpy.types.Scene.ghost_rebuild_budget = FloatProperty(
+        name=bpy.app.translations.pgettext("Rebuild budget (ms)"),
+        description=bpy.app.translations.pgettext("Time per redraw spent rebuilding ghosts; remaining objects are rebuilt on later redraws"),
+        default=8.0, min=1.0, max=100.0)
+    
     # 半透明/非表示用
     bpy.types.Material.ghost_visible = bpy.props.BoolProperty(default=True)
     bpy.types.Material.ghost_hide = bpy.props.BoolProperty(default=False)
     bpy.types.Object.ghost_hide = bpy.props.BoolProperty(default=False)
+    bpy.types.Object.ghost_source = EnumProperty(
+        name=bpy.app.translations.pgettext("Object ghost source"),
+        description=bpy.app.translations.pgettext("Which mesh this object's ghost is built from"),
+        items=[('SCENE', "Scene", "Use the scene's ghost source")] + GHOST_SOURCE_ITEMS,
+        default='SCENE',
+        update=_on_object_source_update)
 
 
 # プロパティのクリア
 def clear_props():
+    del bpy.types.Object.ghost_source
     del bpy.types.Object.ghost_hide
     del bpy.types.Material.ghost_visible
     del bpy.types.Material.ghost_hide
+    del bpy.types.Scene.ghost_rebuild_budget
+    del bpy.types.Scene.ghost_disk_cache_limit
+    del bpy.types.Scene.ghost_disk_cache_dir
+    del bpy.types.Scene.ghost_disk_cache
+    del bpy.types.Scene.ghost_cache_limit
+    del bpy.types.Scene.ghost_stats_hud
+    del bpy.types.Scene.ghost_stats
+    del bpy.types.Scene.ghost_background_build
+    del bpy.types.Scene.ghost_merge_cell_size
+    del bpy.types.Scene.ghost_merge_static
+    del bpy.types.Scene.ghost_batched_draw
+    del bpy.types.Scene.ghost_lod_budget
+    del bpy.types.Scene.ghost_proxy_triangles
+    del bpy.types.Scene.ghost_source
+    del bpy.types.Scene.ghost_lod
+    del bpy.types.Scene.ghost_color_mode
     del bpy.types.Scene.ghost_line_size
     del bpy.types.Scene.mesh_objects_index
     del bpy.types.Scene.mesh_objects
     del bpy.types.Scene.object_ghost_face_color
     del bpy.types.Scene.object_ghost_edge_color
+    del bpy.types.Scene.object_ghost_edge_mode
+    del bpy.types.Scene.object_ghost_feature_angle
     del bpy.types.Scene.object_ghost_display_face
     del bpy.types.Scene.object_ghost_display_edge
     del bpy.types.Scene.edit_ghost_face_color
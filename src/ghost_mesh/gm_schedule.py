@@ -0,0 +1,53 @@
+import time
+import bpy
+from . import gm_jobs
+
+# 残りの再生成を後続の再描画へ回す際のタイマー間隔（秒）
+RESUME_INTERVAL = 0.01
+
+# 再生成の進捗（パネルの進捗表示用）
+_progress = {"done": 0, "total": 0}
+
+# 優先度順に並んだ再生成タスクを 1 フレームの時間予算内で実行する
+# - tasks は (関数, 引数...) のタプルの一覧で、先頭から順に実行する
+# - 進捗を保証するため少なくとも 1 件は実行する
+# - 残りがある場合は bpy.app.timers から View3D を再描画させ、次の描画で続きを行う
+def run(tasks, budget_ms):
+    if not tasks:
+        _progress["done"] = _progress["total"] = 0
+        return 0
+    
+    _progress["total"] = max(_progress["total"], _progress["done"] + len(tasks))
+    deadline = time.perf_counter() + budget_ms / 1000.0
+    count = 0
+    for func, *args in tasks:
+        if count and time.perf_counter() >= deadline:
+            break
+        func(*args)
+        count += 1
+    _progress["done"] += count
+    
+    if not bpy.app.timers.is_registered(_resume):
+        bpy.app.timers.register(_resume, first_interval=RESUME_INTERVAL)
+    return len(tasks) - count
+
+# 再生成の進捗 (完了数, 総数) を返す
+def progress():
+    return _progress["done"], _progress["total"]
+
+# 後続の再描画を要求する（再生成の続きと進捗表示の更新）
+def _resume():
+    gm_jobs.tag_redraw_view3d()
+    return None
+
+
+# 登録処理
+def register():
+    pass
+
+
+# 解除処理
+def unregister():
+    if bpy.app.timers.is_registered(_resume):
+        bpy.app.timers.unregister(_resume)
+    _progress["done"] = _progress["total"] = 0
@@ -0,0 +1,198 @@
+import numpy as np
+from collections import OrderedDict
+from . import gm_core
+
+# シェーダー・UBO の作成と管理
+# - gpu モジュールはアドオン有効化時ではなく、初回描画時に各関数内で読み込む
+
+# インスタンス描画で 1 回のドローコールに渡すモデル行列の最大数
+# - mat4 (64 byte) × 256 = 16KB（GPU が保証する UBO の最小上限）
+INSTANCE_CHUNK = 256
+
+# 再利用のために保持するインスタンス用 UBO の配置の数（リージョン数 × 単色/マテリアル色）
+INSTANCE_LAYOUTS = 8
+
+# マテリアルスロット単位で除外・色分けできるスロット数
+MASK_SLOTS = gm_core.MASK_SLOTS
+
+_shader_cache = None
+_instance_shaders = {}
+_slot_shader_cache = None
+_failed = set()
+_instance_layouts = OrderedDict()
+_color_ubos = {}
+
+# スロットごとの色（rgb）を受け取る UBO の定義
+_SLOT_COLORS_TYPEDEF = "struct GhostSlotColors { vec4 colors[%d]; };" % MASK_SLOTS
+
+# 面の色を決める頂点シェーダーの共通処理
+# - use_slot_color が有効な場合はスロットの色（rgb）と color の不透明度を使用する
+_SLOT_COLOR_SOURCE = (
+    "  int s = int(slot + 0.5);"
+    "  v_color = (use_slot_color != 0 && s < %d) ? vec4(slot_colors.colors[s].rgb, color.a) : color;"
+    % MASK_SLOTS)
+
+# 組み込みシェーダーを取得・キャッシュする関数
+# - 初回呼び出しで組み込みシェーダーを取得し、以後はキャッシュを返す
+# - シェーダー初期化に失敗した場合は None を返す可能性がある
+def get_shader():
+    import gpu
+    global _shader_cache
+    if _shader_cache is None:
+        try:
+            _shader_cache = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+        except Exception:
+            try:
+                _shader_cache = gpu.shader.from_builtin('UNIFORM_COLOR')
+            except Exception as e:
+                print(f"Shader initialization failed: {e}")
+    return _shader_cache
+
+# モデル行列の配列を UBO で受け取るインスタンス描画用シェーダーを取得・キャッシュする関数
+# - instance_offset + gl_InstanceID で各インスタンスのモデル行列を参照する
+#   （複数のグループの行列を 1 つの UBO に詰めて使う）
+# - slot_color を指定した版はスロット番号の頂点属性を持ち、面をマテリアルの色で描画できる
+# - 作成に失敗した環境では None を返し、以後は再作成を試みない
+def get_instance_shader(slot_color=False):
+    import gpu
+    name = ("instance_slot" if slot_color else "instance")
+    if name not in _instance_shaders and name not in _failed:
+        try:
+            info = gpu.types.GPUShaderCreateInfo()
+            info.typedef_source("struct GhostInstances { mat4 model[%d]; };" % INSTANCE_CHUNK)
+            info.uniform_buf(0, "GhostInstances", "instances")
+            info.push_constant('MAT4', "ViewProjectionMatrix")
+            info.push_constant('VEC4', "color")
+            info.push_constant('INT', "instance_offset")
+            info.vertex_in(0, 'VEC3', "pos")
+            info.fragment_out(0, 'VEC4', "FragColor")
+            position = "  gl_Position = ViewProjectionMatrix * instances.model[instance_offset + gl_InstanceID] * vec4(pos, 1.0);"
+            if slot_color:
+                iface = gpu.types.GPUStageInterfaceInfo("ghost_instance_interface")
+                iface.flat('VEC4', "v_color")
+                info.typedef_source(_SLOT_COLORS_TYPEDEF)
+                info.uniform_buf(1, "GhostSlotColors", "slot_colors")
+                info.push_constant('INT', "use_slot_color")
+                info.vertex_in(1, 'FLOAT', "slot")
+                info.vertex_out(iface)
+                info.vertex_source("void main() {" + _SLOT_COLOR_SOURCE + position + "}")
+                info.fragment_source("void main() {  FragColor = v_color;}")
+            else:
+                info.vertex_source("void main() {" + position + "}")
+                info.fragment_source("void main() {  FragColor = color;}")
+            _instance_shaders[name] = gpu.shader.create_from_info(info)
+        except Exception as e:
+            _failed.add(name)
+            print(f"Instance shader initialization failed: {e}")
+    return _instance_shaders.get(name)
+
+# マテリアルスロット番号の頂点属性を使うシェーダーを取得・キャッシュする関数
+# - マスクのビットが立っているスロットのフラグメントを破棄する
+#   （マテリアルの ghost_hide 切替はマスクの変更のみで反映され、バッチの再生成を必要としない）
+# - use_slot_color が有効な場合は面をスロットごとの色で描画する
+# - 作成に失敗した環境では None を返し、以後は再作成を試みない
+def get_slot_shader():
+    import gpu
+    global _slot_shader_cache
+    if _slot_shader_cache is None and "slot" not in _failed:
+        try:
+            iface = gpu.types.GPUStageInterfaceInfo("ghost_slot_interface")
+            iface.flat('FLOAT', "excluded")
+            iface.flat('VEC4', "v_color")
+            info = gpu.types.GPUShaderCreateInfo()
+            info.typedef_source(_SLOT_COLORS_TYPEDEF)
+            info.uniform_buf(0, "GhostSlotColors", "slot_colors")
+            info.push_constant('MAT4', "ModelViewProjectionMatrix")
+            info.push_constant('VEC4', "color")
+            info.push_constant('INT', "mask_lo")
+            info.push_constant('INT', "mask_hi")
+            info.push_constant('INT', "use_slot_color")
+            info.vertex_in(0, 'VEC3', "pos")
+            info.vertex_in(1, 'FLOAT', "slot")
+            info.vertex_out(iface)
+            info.fragment_out(0, 'VEC4', "FragColor")
+            info.vertex_source(
+                "void main()"
+                "{"
+                + _SLOT_COLOR_SOURCE +
+                "  int bits = (s < 32) ? (mask_lo >> s) : ((s < 64) ? (mask_hi >> (s - 32)) : 0);"
+                "  excluded = float(bits & 1);"
+                "  gl_Position = ModelViewProjectionMatrix * vec4(pos, 1.0);"
+                "}")
+            info.fragment_source(
+                "void main()"
+                "{"
+                "  if (excluded > 0.5) {"
+                "    discard;"
+                "  }"
+                "  FragColor = v_color;"
+                "}")
+            _slot_shader_cache = gpu.shader.create_from_info(info)
+        except Exception as e:
+            _failed.add("slot")
+            print(f"Slot shader initialization failed: {e}")
+    return _slot_shader_cache
+
+# マテリアルの ghost_hide をシェーダーでマスクできるかどうか
+# - 未対応の環境では ghost_hide の変更時にバッチを再生成する必要がある
+def slot_mask_supported():
+    return _slot_shader_cache is not None
+
+# グループごとのモデル行列の一覧を共有の UBO に詰め、グループごとの [(UBO, 開始位置, 個数)] を返す
+# - groups は [(グループのキー, [モデル行列])]。全グループの行列を順に INSTANCE_CHUNK 個ずつの UBO に詰め、
+#   UBO の境界をまたぐグループは 2 回に分けて描画する（行列は列優先で格納する）
+# - グループの構成と行列のオブジェクト（移動時のみ作り直される）が前回と同じ場合は詰め直さずに再利用する
+def instance_ranges(groups):
+    import gpu
+    layout_key = tuple(key for key, _ in groups)
+    cached = _instance_layouts.get(layout_key)
+    if cached is not None:
+        _instance_layouts.move_to_end(layout_key)
+        previous, ranges, ubos = cached
+        if all(len(old) == len(matrices) and all(a is b for a, b in zip(old, matrices))
+               for old, (_, matrices) in zip(previous, groups)):
+            return ranges
+    else:
+        ubos = []
+    
+    matrices = [matrix for _, group in groups for matrix in group]
+    pages = -(-len(matrices) // INSTANCE_CHUNK)
+    data = np.zeros((pages * INSTANCE_CHUNK, 4, 4), dtype=np.float32)
+    data[:len(matrices)] = np.array(matrices, dtype=np.float32).transpose(0, 2, 1)
+    for page in range(pages):
+        chunk = data[page * INSTANCE_CHUNK:(page + 1) * INSTANCE_CHUNK].tobytes()
+        if page < len(ubos):
+            ubos[page].update(chunk)
+        else:
+            ubos.append(gpu.types.GPUUniformBuf(chunk))
+    del ubos[pages:]
+    
+    ranges = []
+    start = 0
+    for _, group in groups:
+        parts = []
+        index, end = start, start + len(group)
+        while index < end:
+            page, offset = divmod(index, INSTANCE_CHUNK)
+            count = min(end - index, INSTANCE_CHUNK - offset)
+            parts.append((ubos[page], offset, count))
+            index += count
+        ranges.append(parts)
+        start = end
+    
+    _instance_layouts[layout_key] = ([list(group) for _, group in groups], ranges, ubos)
+    while len(_instance_layouts) > INSTANCE_LAYOUTS:
+        _instance_layouts.popitem(last=False)
+    return ranges
+
+# スロットごとの色の配列 (MASK_SLOTS, 4) から UBO を取得する（同じ内容の UBO は共有する）
+# - colors が None の場合は未使用時にバインドする空の UBO を返す
+def color_ubo(colors):
+    import gpu
+    data = (colors if colors is not None else np.zeros((MASK_SLOTS, 4), dtype=np.float32)).tobytes()
+    ubo = _color_ubos.get(data)
+    if ubo is None:
+        if len(_color_ubos) >= 256:
+            _color_ubos.clear()
+        ubo = _color_ubos[data] = gpu.types.GPUUniformBuf(data)
+    return ubo
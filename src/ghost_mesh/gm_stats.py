@@ -0,0 +1,156 @@
+import bpy
+import json
+import time
+from collections import deque
+from bpy_extras.io_utils import ExportHelper
+
+# 各処理段階の計測値を保持するフレーム数（ローリングウィンドウ）
+WINDOW = 240
+
+# HUD に表示する処理段階（表示順）
+STAGES = ("frame", "cull", "rebuild", "draw", "handler", "list_sync")
+
+# 計測の有効/無効（ghost_stats プロパティの update から切り替える）
+enabled = False
+
+_samples = {}
+_totals = {}
+_hud_handle = None
+
+# 処理段階の所要時間を計測するコンテキストマネージャー
+# - 計測結果はミリ秒で段階ごとのローリングウィンドウに追加する
+class _stageTimer:
+    __slots__ = ("name", "start")
+    
+    def __init__(self, name):
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        add_sample(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+# 計測しない場合に返す何もしないコンテキストマネージャー
+class _nullTimer:
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _nullTimer()
+
+# 処理段階のタイマーを返す（計測が無効な場合は何もしないタイマー）
+def timer(name):
+    return _stageTimer(name) if enabled else _NULL_TIMER
+
+# 計測値を追加する
+def add_sample(name, ms):
+    samples = _samples.get(name)
+    if samples is None:
+        samples = _samples[name] = deque(maxlen=WINDOW)
+    samples.append(ms)
+    count, total = _totals.get(name, (0, 0.0))
+    _totals[name] = (count + 1, total + ms)
+
+# 計測値を全て破棄する
+def reset():
+    _samples.clear()
+    _totals.clear()
+
+# 並べ替え済みの値から百分位数を返す（最近傍法）
+def _percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * p / 100.0), len(ordered) - 1)]
+
+# 処理段階ごとの集計（直近 WINDOW 回の平均・百分位数・最大と累計）を返す
+def summary():
+    result = {}
+    for name, samples in _samples.items():
+        ordered = sorted(samples)
+        count, total = _totals[name]
+        result[name] = {
+            "count": count,
+            "total_ms": total,
+            "mean_ms": sum(ordered) / len(ordered),
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            "p99_ms": _percentile(ordered, 99),
+            "max_ms": ordered[-1],
+        }
+    return result
+
+# View3D 上に Ghost Mesh の処理時間を表示する（POST_PIXEL）
+def draw_hud():
+    import blf
+    scn = bpy.context.scene
+    if not enabled or not getattr(scn, "ghost_stats_hud", False):
+        return
+    stats = summary()
+    frame = stats.get("frame")
+    if frame is None:
+        return
+    
+    font_id = 0
+    blf.size(font_id, 12)
+    blf.color(font_id, 1.0, 1.0, 1.0, 0.9)
+    x = 20
+    y = bpy.context.region.height - 80
+    lines = [f"Ghost Mesh  {frame['mean_ms']:.2f} ms/frame  (p95 {frame['p95_ms']:.2f} ms)"]
+    for name in STAGES[1:]:
+        stage = stats.get(name)
+        if stage is not None:
+            lines.append(f"  {name:<10} {stage['mean_ms']:7.2f}  p95 {stage['p95_ms']:7.2f}  max {stage['max_ms']:7.2f}")
+    for line in lines:
+        blf.position(font_id, x, y, 0)
+        blf.draw(font_id, line)
+        y -= 16
+
+# 計測結果を JSON ファイルに書き出すオペレータ
+# - 処理段階ごとの集計、オブジェクトごとのカウンタ、キャッシュの統計を含む
+class GM_OT_ExportStats(bpy.types.Operator, ExportHelper):
+    bl_idname = "gm.export_stats"
+    bl_label = bpy.app.translations.pgettext("Export ghost stats")
+    bl_description = bpy.app.translations.pgettext("Write ghost rendering timings and counters to a JSON file")
+    
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+    
+    def execute(self, context):
+        from . import gm_disk, gm_draw
+        data = {
+            "blender": bpy.app.version_string,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "window": WINDOW,
+            "stages": summary(),
+            "cache": gm_draw._draw_objects.stats(),
+            "disk_cache": gm_disk.all_stats(),
+            "merged": gm_draw.merged_stats(),
+            "objects": gm_draw.object_stats(),
+        }
+        with open(self.filepath, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        self.report({'INFO'}, self.filepath)
+        return {'FINISHED'}
+
+
+def register():
+    global _hud_handle
+    bpy.utils.register_class(GM_OT_ExportStats)
+    _hud_handle = bpy.types.SpaceView3D.draw_handler_add(draw_hud, (), 'WINDOW', 'POST_PIXEL')
+
+
+def unregister():
+    global _hud_handle, enabled
+    if _hud_handle is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(_hud_handle, 'WINDOW')
+        _hud_handle = None
+    bpy.utils.unregister_class(GM_OT_ExportStats)
+    enabled = False
+    reset()